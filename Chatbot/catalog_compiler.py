@@ -0,0 +1,404 @@
+import json
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from scoring_rules import DEFAULT_SCORE, SCORE_KEYS
+
+# ---------------------------------------------------------
+# 1. 컴파일된 팀 카탈로그 포맷 (.teamcat)
+# ---------------------------------------------------------
+# [MAGIC 8바이트][헤더 길이 uint32][헤더 JSON][배열들 (64바이트 정렬)]
+# 헤더에는 배열 이름 / dtype / shape / 위치와 원본 JSON 목록(경로, mtime, 크기)만 들어있고,
+# 실제 데이터는 모두 numpy 배열이다.
+# - scores        : uint8 (팀 수, 7)         점수 행렬 (SCORE_KEYS 순서)
+# - founded_year  : int16 (팀 수,)           없으면 -1
+# - league/sport  : uint16 (팀 수,)          문자열 테이블 번호
+# - tag_indptr    : uint32 (팀 수 + 1,)      CSR: 팀 i 의 태그는 tag_ids[indptr[i]:indptr[i+1]]
+# - tag_ids       : uint32 (태그 수 합,)     태그 문자열 테이블 번호 (중복 태그는 한 번만 저장)
+# - 문자열 테이블  : <이름>.blob (utf-8 바이트) + <이름>.offsets (uint64)
+# 파일 전체를 mmap 해서 배열을 그대로 가리키므로 로딩은 헤더 파싱 비용뿐이다.
+MAGIC = b'TEAMCAT1'
+ALIGN = 64
+TEAM_STRINGS = ['team_name', 'home_city', 'home_stadium', 'meta_description']
+SCORE_INDEX = {key: j for j, key in enumerate(SCORE_KEYS)}
+N_SCORES = len(SCORE_KEYS)
+
+
+# ---------------------------------------------------------
+# 2. 스키마 검증
+# ---------------------------------------------------------
+def validate_team(team, idx):
+    """final_team_data.json 스키마 검증. 문제가 있으면 몇 번째 어떤 팀인지 알려준다."""
+    name = team.get('team_name') if isinstance(team, dict) else None
+    where = f"{idx}번째 팀({name})"
+    if not isinstance(team, dict):
+        raise ValueError(f"{where}: 팀 데이터는 dict 여야 합니다.")
+    for key in ('team_name', 'league', 'sport'):
+        if not isinstance(team.get(key), str) or not team[key]:
+            raise ValueError(f"{where}: '{key}' 는 비어있지 않은 문자열이어야 합니다.")
+    for key in ('home_city', 'home_stadium', 'meta_description'):
+        if team.get(key) is not None and not isinstance(team[key], str):
+            raise ValueError(f"{where}: '{key}' 는 문자열 또는 null 이어야 합니다.")
+    year = team.get('founded_year')
+    if year is not None and (not isinstance(year, int) or not 0 < year < 2 ** 15):
+        raise ValueError(f"{where}: 'founded_year' 가 올바른 연도가 아닙니다: {year}")
+    tags = team.get('style_tags')
+    if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+        raise ValueError(f"{where}: 'style_tags' 는 문자열 리스트여야 합니다.")
+    scores = team.get('scores')
+    if not isinstance(scores, dict):
+        raise ValueError(f"{where}: 'scores' 가 없습니다.")
+    for key in SCORE_KEYS:
+        value = scores.get(key)
+        if not isinstance(value, int) or not 0 <= value <= 10:
+            raise ValueError(f"{where}: scores['{key}'] 는 0~10 정수여야 합니다: {value}")
+
+
+# ---------------------------------------------------------
+# 3. 컴파일
+# ---------------------------------------------------------
+def _string_table(values):
+    encoded = [v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _intern(values):
+    table, ids = {}, []
+    for v in values:
+        ids.append(table.setdefault(v, len(table)))
+    return list(table), ids
+
+
+def compile_catalog(teams, out_path='teams.teamcat', sources=()):
+    """sources 는 source_signature() 결과. 헤더에 저장해 두고 load_or_compile 이 비교한다."""
+    first_index = {}
+    for i, team in enumerate(teams):
+        validate_team(team, i)
+        # Node2Vec 관계망 / Catalog / find() 가 모두 팀 이름을 키로 쓰므로 이름은 유일해야 한다
+        j = first_index.setdefault(team['team_name'], i)
+        if j != i:
+            raise ValueError(f"{i}번째 팀({team['team_name']}): {j}번째 팀과 team_name 이 중복됩니다.")
+
+    arrays = {}
+    arrays['scores'] = np.array([[t['scores'][k] for k in SCORE_KEYS] for t in teams], dtype=np.uint8) \
+        .reshape(len(teams), len(SCORE_KEYS))
+    arrays['founded_year'] = np.array([t.get('founded_year') or -1 for t in teams], dtype=np.int16)
+
+    for key in ('league', 'sport'):
+        table, ids = _intern(t[key] for t in teams)
+        arrays[key] = np.array(ids, dtype=np.uint16)
+        arrays[f'{key}_names.blob'], arrays[f'{key}_names.offsets'] = _string_table(table)
+
+    # 태그: 전체 카탈로그에서 한 번만 저장하고 팀별로는 번호만 (CSR)
+    tag_table, tag_ids, indptr = {}, [], [0]
+    for t in teams:
+        for tag in dict.fromkeys(t['style_tags']):
+            tag_ids.append(tag_table.setdefault(tag, len(tag_table)))
+        indptr.append(len(tag_ids))
+    arrays['tag_indptr'] = np.array(indptr, dtype=np.uint32)
+    arrays['tag_ids'] = np.array(tag_ids, dtype=np.uint32)
+    arrays['tags.blob'], arrays['tags.offsets'] = _string_table(list(tag_table))
+
+    for key in TEAM_STRINGS:
+        arrays[f'{key}.blob'], arrays[f'{key}.offsets'] = _string_table([t.get(key) or '' for t in teams])
+    # home_stadium 처럼 null 이 허용되는 값은 빈 문자열과 구분하기 위해 따로 표시
+    arrays['null_mask'] = np.array([[t.get(k) is None for k in TEAM_STRINGS] for t in teams], dtype=np.bool_) \
+        .reshape(len(teams), len(TEAM_STRINGS))
+
+    # 헤더 위치 계산 (헤더 길이가 바뀌면 위치도 바뀌므로 고정될 때까지 반복)
+    header_len = 0
+    while True:
+        offset, layout = 0, {}
+        data_start = -(-(len(MAGIC) + 4 + header_len) // ALIGN) * ALIGN
+        for name, arr in arrays.items():
+            offset = -(-offset // ALIGN) * ALIGN
+            layout[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": data_start + offset}
+            offset += arr.nbytes
+        header = json.dumps({"count": len(teams), "score_keys": SCORE_KEYS, "sources": list(sources),
+                             "arrays": layout}, ensure_ascii=False).encode('utf-8')
+        if len(header) == header_len:
+            break
+        header_len = len(header)
+
+    # 임시 파일에 쓴 뒤 교체: 이미 mmap 으로 열려 있는 이전 카탈로그는 그대로 유효하다
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for name, arr in arrays.items():
+            f.write(b'\0' * (layout[name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(arr).tobytes())
+    os.replace(tmp_path, out_path)
+    print(f"✅ 카탈로그 컴파일 완료: 팀 {len(teams)}개, 태그 {len(tag_table)}개 -> '{out_path}'")
+    return out_path
+
+
+# ---------------------------------------------------------
+# 4. 읽기 전용 뷰
+# ---------------------------------------------------------
+class StringTable:
+    __slots__ = ('blob', 'offsets')
+
+    def __init__(self, blob, offsets):
+        self.blob, self.offsets = blob, offsets
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+class Team:
+    """
+    컴파일된 카탈로그의 팀 한 개. 값은 접근할 때 배열에서 바로 읽는다.
+    기존 dict 기반 코드(team['team_name'], team.get('style_tags'), team['scores'].get(...))도
+    그대로 동작하도록 __getitem__ / get 을 제공한다.
+    점수 계산 같은 반복 구간에서는 dict 를 만드는 scores 대신 score(key) / score_array 를 쓴다.
+    팀 이름과 style_tags 는 팀마다 처음 한 번만 디코딩해 카탈로그에 캐시한다.
+    """
+    __slots__ = ('_cat', '_i')
+
+    def __init__(self, catalog, i):
+        self._cat, self._i = catalog, i
+
+    def _string(self, key):
+        if self._cat.null_mask[self._i, TEAM_STRINGS.index(key)]:
+            return None
+        return self._cat.strings[key][self._i]
+
+    @property
+    def team_name(self):
+        return self._cat._names[self._i] or self._cat.team_name(self._i)
+
+    @property
+    def league(self):
+        return self._cat.league_names[int(self._cat.league[self._i])]
+
+    @property
+    def sport(self):
+        return self._cat.sport_names[int(self._cat.sport[self._i])]
+
+    @property
+    def home_city(self):
+        return self._string('home_city')
+
+    @property
+    def home_stadium(self):
+        return self._string('home_stadium')
+
+    @property
+    def meta_description(self):
+        return self._string('meta_description')
+
+    @property
+    def founded_year(self):
+        year = int(self._cat.founded_year[self._i])
+        return None if year < 0 else year
+
+    @property
+    def tag_ids(self):
+        return self._cat.tag_ids[self._cat.tag_indptr[self._i]:self._cat.tag_indptr[self._i + 1]]
+
+    @property
+    def style_tags(self):
+        tags = self._cat._tags[self._i]
+        return self._cat.style_tags(self._i) if tags is None else tags
+
+    @property
+    def score_array(self):
+        return self._cat.scores[self._i]
+
+    @property
+    def scores(self):
+        return dict(zip(SCORE_KEYS, self._cat.scores[self._i].tolist()))
+
+    def score(self, key, default=DEFAULT_SCORE):
+        j = SCORE_INDEX.get(key)
+        if j is None:
+            return default
+        # numpy 스칼라 인덱싱보다 1차원 memoryview 인덱싱이 훨씬 빠르다 (dict.get 과 비슷한 수준)
+        return self._cat.score_view[self._i * N_SCORES + j]
+
+    # -- dict 호환 --------------------------------------------------------
+    FIELDS = ('league', 'sport', 'team_name', 'home_city', 'home_stadium', 'founded_year',
+              'style_tags', 'scores', 'meta_description')
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def to_dict(self):
+        data = {key: getattr(self, key) for key in self.FIELDS}
+        data['style_tags'] = list(data['style_tags'])
+        return data
+
+    def __repr__(self):
+        return f"Team({self.team_name!r}, {self.league!r})"
+
+
+def read_header(path):
+    """배열은 건드리지 않고 헤더(JSON)만 읽는다."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"컴파일된 카탈로그 파일이 아닙니다: {path}")
+        (header_len,) = struct.unpack('<I', f.read(4))
+        return json.loads(f.read(header_len))
+
+
+class CompiledCatalog:
+    def __init__(self, path):
+        header = read_header(path)
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'])) if spec['shape'] else 1
+            arrays[name] = np.frombuffer(self._mm, dtype=dtype, count=count,
+                                         offset=spec['offset']).reshape(spec['shape'])
+
+        self.count = header['count']
+        self.sources = header.get('sources', [])
+        self.scores = arrays['scores']
+        self.founded_year = arrays['founded_year']
+        self.league, self.sport = arrays['league'], arrays['sport']
+        self.tag_indptr, self.tag_ids = arrays['tag_indptr'], arrays['tag_ids']
+        self.null_mask = arrays['null_mask']
+        self.league_names = StringTable(arrays['league_names.blob'], arrays['league_names.offsets'])
+        self.sport_names = StringTable(arrays['sport_names.blob'], arrays['sport_names.offsets'])
+        self.tag_names = StringTable(arrays['tags.blob'], arrays['tags.offsets'])
+        self.strings = {k: StringTable(arrays[f'{k}.blob'], arrays[f'{k}.offsets']) for k in TEAM_STRINGS}
+        self.score_view = memoryview(self.scores).cast('B')  # scores 를 1차원 int 로 읽는 뷰 (uint8, C 순서)
+        self._name_index = None
+        self._names = [None] * self.count  # 팀별 디코딩 캐시
+        self._tags = [None] * self.count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not -self.count <= i < self.count:
+            raise IndexError(i)
+        return Team(self, i % self.count)
+
+    def __iter__(self):
+        return (Team(self, i) for i in range(self.count))
+
+    def team_name(self, i):
+        name = self._names[i]
+        if name is None:
+            name = self._names[i] = self.strings['team_name'][i]
+        return name
+
+    def style_tags(self, i):
+        """팀 i 의 태그 (읽기 전용 tuple)."""
+        tags = self._tags[i]
+        if tags is None:
+            ids = self.tag_ids[self.tag_indptr[i]:self.tag_indptr[i + 1]]
+            tags = self._tags[i] = tuple(self.tag_names[int(t)] for t in ids)
+        return tags
+
+    def find(self, team_name):
+        """팀 이름 -> Team (처음 호출할 때 이름 색인을 만든다)."""
+        if self._name_index is None:
+            self._name_index = {self.team_name(i): i for i in range(self.count)}
+        i = self._name_index.get(team_name)
+        return None if i is None else Team(self, i)
+
+
+# ---------------------------------------------------------
+# 5. JSON 폴더 <-> 컴파일 결과
+# ---------------------------------------------------------
+def source_files(paths, exclude=()):
+    """파일/폴더 경로 목록을 실제로 읽을 JSON 파일 목록으로 펼친다 (폴더는 이름순, exclude 이름은 제외)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, n) for n in sorted(os.listdir(path))
+                         if n.endswith('.json') and n not in exclude)
+        else:
+            files.append(path)
+    return files
+
+
+def read_team_json(paths):
+    """팀 목록 JSON(list) 또는 팀별 JSON(dict) 파일/폴더를 읽는다."""
+    teams = []
+    for file in source_files(paths):
+        with open(file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        teams.extend(data if isinstance(data, list) else [data])
+    return teams
+
+
+def source_signature(files):
+    """원본 JSON 목록의 [경로, mtime_ns, 크기]. 파일이 추가/삭제되거나 내용이 바뀌면 달라진다."""
+    return [[os.path.normpath(f), os.stat(f).st_mtime_ns, os.stat(f).st_size] for f in files]
+
+
+def load_or_compile(paths, artifact_path, exclude=()):
+    """
+    paths(파일/폴더 목록)의 JSON 이 컴파일 당시와 같으면 바로 mmap 으로 열고, 아니면 다시 컴파일한다.
+    exclude 는 폴더 안에 있지만 팀 데이터가 아닌 JSON 파일 이름들.
+    mtime 비교만 하면 삭제된 파일이나 더 오래된 파일로 되돌린 경우를 놓치므로
+    헤더에 저장된 원본 목록(경로, mtime, 크기)과 그대로 비교한다.
+    """
+    files = source_files(paths, exclude)
+    signature = source_signature(files)
+    try:
+        fresh = read_header(artifact_path).get('sources') == signature
+    except (OSError, ValueError, struct.error):
+        fresh = False
+    if not fresh:
+        compile_catalog(read_team_json(files), artifact_path, sources=signature)
+    return CompiledCatalog(artifact_path)
+
+
+def benchmark(json_paths, artifact_path):
+    import tracemalloc
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    teams = read_team_json(json_paths)
+    json_s = time.perf_counter() - start
+    json_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del teams
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    catalog = CompiledCatalog(artifact_path)
+    compiled_s = time.perf_counter() - start
+    compiled_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"⏱️ JSON 로딩: {json_s * 1000:.1f} ms, 메모리 {json_mem / 1e6:.1f} MB")
+    print(f"⏱️ 컴파일 카탈로그 로딩: {compiled_s * 1000:.2f} ms, 메모리 {compiled_mem / 1e6:.3f} MB "
+          f"(mmap 파일 {os.path.getsize(artifact_path) / 1e6:.1f} MB, 팀 {len(catalog)}개)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="팀 JSON -> 컴파일된 바이너리 카탈로그")
+    parser.add_argument('teams', nargs='+', help="팀 목록 JSON 또는 팀별 JSON 이 들어있는 폴더")
+    parser.add_argument('--out', default='teams.teamcat')
+    parser.add_argument('--bench', action='store_true', help="JSON 대비 로딩 시간/메모리 비교")
+    args = parser.parse_args()
+
+    compile_catalog(read_team_json(args.teams), args.out, sources=source_signature(source_files(args.teams)))
+    if args.bench:
+        benchmark(args.teams, args.out)
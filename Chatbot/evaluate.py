@@ -0,0 +1,246 @@
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline_stats import STATS
+from scoring_rules import (ALPHA, BETA, CATEGORY_KEYWORDS, DEFAULT_CATEGORY, DEFAULT_SCORE, RICH_MONEY,
+                           SCORE_KEYS, UNDERDOG_KEYWORDS, UNDERDOG_PENALTY, identity_weight)
+
+# ---------------------------------------------------------
+# 1. 테스트셋 로드 (파일마다 다른 컬럼 이름을 통일)
+# ---------------------------------------------------------
+# query / target_team / category / anchor_team 네 컬럼으로 맞춘다.
+TEST_COLUMNS = {
+    "테스트_질문.csv": {"사용자_질문": "query", "타겟_팀": "target_team", "테스트_카테고리": "category"},
+    "unified_logic_test_data.csv": {"질문": "query", "정답 팀": "target_team", "사용자 유형": "category",
+                                    "기존 응원팀": "anchor_team"},
+    "synthetic_user_queries.csv": {"user_query": "query", "target_team": "target_team", "category": "category"},
+}
+
+
+def load_test_set(paths):
+    frames = []
+    for path in paths:
+        name = os.path.basename(path)
+        if name not in TEST_COLUMNS:
+            raise ValueError(f"컬럼 매핑이 없는 테스트 파일입니다: {name}")
+        df = pd.read_csv(path, encoding='utf-8-sig').rename(columns=TEST_COLUMNS[name])
+        if 'anchor_team' not in df:
+            df['anchor_team'] = None
+        df['source'] = name
+        frames.append(df[['query', 'target_team', 'category', 'anchor_team', 'source']])
+    df = pd.concat(frames, ignore_index=True)
+    df['anchor_team'] = df['anchor_team'].where(~df['anchor_team'].isin(["None", "없음"]), None)
+    return df
+
+
+# ---------------------------------------------------------
+# 2. 점수 백엔드: score(queries, anchors) -> (질문 수, 팀 수) 행렬
+# ---------------------------------------------------------
+# 새 백엔드(증류 모델, 인덱스 등)는 같은 score() 를 구현해서 BACKENDS 에 등록하면
+# 아래 evaluate() 로 그대로 비교할 수 있다.
+# 점수 규칙(카테고리 키워드, 언더독 페널티, ALPHA/BETA)은 scoring_rules.py 를 label_generator2 와 같이 쓴다.
+
+
+def _contains_any(queries, keywords):
+    return np.array([any(k in q for k in keywords) for q in queries], dtype=bool)
+
+
+class KeywordScorer:
+    """질문에 팀 태그가 그대로 들어있는 개수로 점수를 매기는 가장 단순한 기준선."""
+
+    def __init__(self, teams):
+        self.team_names = [t['team_name'] for t in teams]
+        self.tags = sorted({tag for t in teams for tag in t.get('style_tags', [])})
+        tag_index = {tag: i for i, tag in enumerate(self.tags)}
+        # 팀 x 태그 보유 행렬
+        self.team_tags = np.zeros((len(teams), len(self.tags)), dtype=np.float32)
+        for i, t in enumerate(teams):
+            for tag in t.get('style_tags', []):
+                self.team_tags[i, tag_index[tag]] = 1.0
+
+    def tag_matches(self, queries):
+        lowered = [q.lower() for q in queries]
+        hits = np.zeros((len(queries), len(self.tags)), dtype=np.float32)
+        for j, tag in enumerate(self.tags):
+            key = tag.lower()
+            hits[:, j] = [key in q for q in lowered]
+        return hits @ self.team_tags.T  # (질문, 팀) 일치 태그 수
+
+    def score(self, queries, anchors):
+        matched = self.tag_matches(queries)
+        return np.where(matched > 0, np.minimum(0.9, 0.4 + 0.15 * matched), 0.1)
+
+
+class FormulaScorer(KeywordScorer):
+    """
+    calculate_integrated_score 수식을 (질문 x 팀) 행렬로 한 번에 계산한다.
+    ((ALPHA * S_semantic) + (BETA * S_relational)) * W_identity * penalty
+    - encoder 가 있으면 S_semantic 은 임베딩 코사인 유사도, 없으면 태그 일치 점수
+    - n2v_model 이 있으면 S_relational 은 응원팀과의 Node2Vec 유사도, 없으면 0.5
+    """
+
+    def __init__(self, teams, encoder=None, n2v_model=None):
+        super().__init__(teams)
+        self.encoder = encoder
+        self.n2v_model = n2v_model
+        self.team_scores = np.array(
+            [[t.get('scores', {}).get(k, DEFAULT_SCORE) for k in SCORE_KEYS] for t in teams], dtype=np.float32)
+        self.money = np.array([t.get('scores', {}).get('money', 0) for t in teams], dtype=np.float32)
+        if encoder is not None:
+            emb = encoder.encode([" ".join(t.get('style_tags', [])) for t in teams])
+            self.team_emb = emb / np.linalg.norm(emb, axis=1, keepdims=True)
+
+    def semantic(self, queries):
+        if self.encoder is None:
+            return KeywordScorer.score(self, queries, None)
+        emb = self.encoder.encode(list(queries), batch_size=64)
+        emb = emb / np.linalg.norm(emb, axis=1, keepdims=True)
+        return emb @ self.team_emb.T
+
+    def relational(self, unique_anchors, inverse):
+        """응원팀 종류마다 (팀 수,) 유사도 벡터를 한 번만 계산하고 질문 행으로 펼친다."""
+        rel = np.full((len(unique_anchors), len(self.team_names)), 0.5, dtype=np.float32)
+        if self.n2v_model is not None:
+            wv = self.n2v_model.wv
+            in_vocab = np.array([name in wv for name in self.team_names], dtype=bool)
+            team_vectors = wv[[n for n, ok in zip(self.team_names, in_vocab) if ok]]
+            for u, anchor in enumerate(unique_anchors):
+                if anchor and anchor in wv:
+                    rel[u, in_vocab] = wv.cosine_similarities(wv[anchor], team_vectors)
+        return rel[inverse]
+
+    def self_mask(self, unique_anchors, inverse):
+        """응원팀 본인(부분 일치 포함) 위치. 응원팀 종류마다 한 번만 이름을 비교한다."""
+        mask = np.array([[bool(anchor) and (anchor in name or name in anchor) for name in self.team_names]
+                         for anchor in unique_anchors], dtype=bool).reshape(len(unique_anchors), -1)
+        return mask[inverse]
+
+    def identity(self, queries):
+        category = np.full(len(queries), SCORE_KEYS.index(DEFAULT_CATEGORY))
+        decided = np.zeros(len(queries), dtype=bool)
+        for key, keywords in CATEGORY_KEYWORDS:
+            hit = _contains_any(queries, keywords) & ~decided
+            category[hit] = SCORE_KEYS.index(key)
+            decided |= hit
+        return identity_weight(self.team_scores[:, category].T)
+
+    def score(self, queries, anchors):
+        with STATS.timer('eval.semantic'):
+            s_semantic = self.semantic(queries)
+        # 응원팀 없음(None)은 빈 문자열로 모아 하나의 행으로 처리
+        unique_anchors, inverse = np.unique([a or "" for a in anchors], return_inverse=True)
+        s_relational = self.relational(unique_anchors, inverse)
+        w_identity = self.identity(queries)
+        penalty = np.where(_contains_any(queries, UNDERDOG_KEYWORDS)[:, None] & (self.money[None, :] >= RICH_MONEY),
+                           UNDERDOG_PENALTY, 1.0)
+        final = ((ALPHA * s_semantic) + (BETA * s_relational)) * w_identity * penalty
+
+        # 응원팀 본인은 추천에서 제외 (부분 일치 포함)
+        final[self.self_mask(unique_anchors, inverse)] = 0.0
+        return final
+
+
+def _keyword_scorer(teams, n2v_model=None):
+    # 관계망을 쓰지 않는 기준선
+    return KeywordScorer(teams)
+
+
+def _sbert_scorer(teams, n2v_model=None):
+    from sentence_transformers import SentenceTransformer
+    return FormulaScorer(teams, encoder=SentenceTransformer('snunlp/KR-SBERT-V40K-klueNLI-augSTS'),
+                         n2v_model=n2v_model)
+
+
+# 이름 -> (teams, n2v_model) 을 받아 스코어러를 만드는 함수
+BACKENDS = {
+    "keyword": _keyword_scorer,
+    "formula": FormulaScorer,
+    "sbert": _sbert_scorer,
+}
+
+
+# ---------------------------------------------------------
+# 3. 평가: 순위 지표 + 처리 속도
+# ---------------------------------------------------------
+def rank_metrics(scores, target_idx):
+    """정답 팀의 순위로 top-1/top-5/MRR/NDCG 를 계산한다 (정답은 질문당 하나)."""
+    target_scores = scores[np.arange(len(target_idx)), target_idx]
+    # 동점 팀은 무작위로 순서를 정했을 때의 기대 순위로 계산한다
+    # (모든 팀이 같은 점수면 정답이 1등으로 잡히는 착시를 막기 위함)
+    higher = (scores > target_scores[:, None]).sum(axis=1)
+    ties = (scores == target_scores[:, None]).sum(axis=1) - 1
+    rank = higher + 1 + ties / 2
+    return pd.DataFrame({
+        "top1": rank <= 1,
+        "top5": rank <= 5,
+        "mrr": 1.0 / rank,
+        "ndcg": 1.0 / np.log2(rank + 1),
+        "rank": rank,
+    })
+
+
+def evaluate(test_df, teams, scorer):
+    team_index = {t['team_name']: i for i, t in enumerate(teams)}
+    known = test_df['target_team'].isin(team_index)
+    if (~known).any():
+        print(f"⚠️ 카탈로그에 없는 정답 팀이 있어 {(~known).sum()}개 질문을 제외합니다.")
+    test_df = test_df[known].reset_index(drop=True)
+
+    queries = test_df['query'].tolist()
+    anchors = [a if isinstance(a, str) else None for a in test_df['anchor_team']]
+
+    start = time.perf_counter()
+    with STATS.timer('eval.score'):
+        scores = np.asarray(scorer.score(queries, anchors))
+    elapsed = time.perf_counter() - start
+
+    target_idx = test_df['target_team'].map(team_index).to_numpy()
+    per_query = pd.concat([test_df[['category', 'source']], rank_metrics(scores, target_idx)], axis=1)
+
+    metrics = ['top1', 'top5', 'mrr', 'ndcg']
+    table = per_query.groupby('category')[metrics].mean()
+    table['n'] = per_query.groupby('category').size()
+    table.loc['전체'] = list(per_query[metrics].mean()) + [len(per_query)]
+    table['n'] = table['n'].astype(int)
+    qps = len(queries) / elapsed if elapsed > 0 else float('inf')
+    return table, qps
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="추천 품질/속도 오프라인 평가")
+    parser.add_argument('--test', nargs='+', default=['테스트_질문.csv', 'unified_logic_test_data.csv'])
+    parser.add_argument('--teams', default='final_team_data.json')
+    parser.add_argument('--backend', nargs='+', default=['keyword', 'formula'], choices=list(BACKENDS))
+    parser.add_argument('--n2v', default=None,
+                        help="label_generator2 가 저장한 Node2Vec 모델 경로 (예: n2v.model). 없으면 S_relational=0.5")
+    parser.add_argument('--out', default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    with open(args.teams, 'r', encoding='utf-8') as f:
+        teams = json.load(f)
+    n2v_model = None
+    if args.n2v:
+        from gensim.models import Word2Vec
+        n2v_model = Word2Vec.load(args.n2v)
+    test_df = load_test_set(args.test)
+    print(f"✅ 테스트 질문 {len(test_df)}개, 후보 팀 {len(teams)}개")
+
+    results = {}
+    for name in args.backend:
+        table, qps = evaluate(test_df, teams, BACKENDS[name](teams, n2v_model=n2v_model))
+        print(f"\n📊 [{name}] {qps:,.0f} queries/s")
+        print(table.round(4).to_string())
+        results[name] = {"queries_per_s": qps, "metrics": table.round(6).to_dict(orient='index')}
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✨ '{args.out}' 저장 완료!")
@@ -0,0 +1,236 @@
+import json
+import os
+import time
+
+import networkx as nx
+import numpy as np
+from gensim.models import Word2Vec
+
+# ---------------------------------------------------------
+# 1. 설정 (label_generator2.train_node2vec 과 같은 값)
+# ---------------------------------------------------------
+# 기존 Node2Vec(p=1, q=1)은 가중치 비례 랜덤 워크와 같으므로 워크를 직접 만든다.
+# 그래야 전체 학습/증분 학습이 같은 워크 분포와 같은 시드를 쓸 수 있다.
+DIMENSIONS = 64
+WALK_LENGTH = 10
+NUM_WALKS = 40
+WINDOW = 5
+SEED = 42
+# 태그 관계망은 촘촘해서 2홉이면 거의 전체 팀이 영향 범위에 들어간다 (증분의 의미가 없어짐)
+HOPS = 1
+# 영향 노드가 전체의 이 비율을 넘으면 증분 학습이 전체 재학습보다 빠르지 않으므로 전체 재학습으로 전환
+MAX_AFFECTED_SHARE = 0.5
+
+
+def build_graph(teams):
+    """공통 style_tags 개수를 가중치로 하는 팀 관계망. 태그 역색인으로 같은 태그를 가진 팀끼리만 비교한다."""
+    tag_teams = {}
+    for team in teams:
+        for tag in set(team.get('style_tags', [])):
+            tag_teams.setdefault(tag, []).append(team['team_name'])
+
+    weights = {}
+    for members in tag_teams.values():
+        for i in range(len(members)):
+            for j in range(i + 1, len(members)):
+                key = (members[i], members[j]) if members[i] < members[j] else (members[j], members[i])
+                weights[key] = weights.get(key, 0) + 1
+
+    G = nx.Graph()
+    G.add_weighted_edges_from((a, b, w) for (a, b), w in weights.items())
+    return G
+
+
+def random_walks(G, start_nodes, num_walks=NUM_WALKS, walk_length=WALK_LENGTH, seed=SEED):
+    """start_nodes 에서만 가중치 비례 랜덤 워크를 num_walks 번씩 만든다 (라운드마다 시작 순서 섞음)."""
+    rng = np.random.default_rng(seed)
+    neighbors, cum_weights = {}, {}
+    for node in G.nodes:
+        nbrs = list(G[node])
+        neighbors[node] = nbrs
+        cum_weights[node] = np.cumsum([G[node][n].get('weight', 1) for n in nbrs])
+
+    start_nodes = [n for n in start_nodes if n in G]
+    walks = []
+    for _ in range(num_walks):
+        for idx in rng.permutation(len(start_nodes)):
+            walk = [start_nodes[idx]]
+            while len(walk) < walk_length:
+                cur = walk[-1]
+                if not neighbors[cur]:
+                    break
+                cw = cum_weights[cur]
+                walk.append(neighbors[cur][int(np.searchsorted(cw, rng.random() * cw[-1], side='right'))])
+            walks.append(walk)
+    return walks
+
+
+# ---------------------------------------------------------
+# 2. 전체 학습 / 증분 학습
+# ---------------------------------------------------------
+def train_full(teams, seed=SEED):
+    G = build_graph(teams)
+    if len(G.nodes) == 0:
+        return None
+    walks = random_walks(G, list(G.nodes), seed=seed)
+    # workers=1 이어야 같은 시드에서 결과가 재현된다
+    return Word2Vec(walks, vector_size=DIMENSIONS, window=WINDOW, min_count=1, sg=1, workers=1, seed=seed)
+
+
+def catalog_diff(old_teams, new_teams):
+    """팀 이름 기준으로 추가 / 삭제 / 태그 변경 팀을 찾는다."""
+    old = {t['team_name']: set(t.get('style_tags', [])) for t in old_teams}
+    new = {t['team_name']: set(t.get('style_tags', [])) for t in new_teams}
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "retagged": sorted(n for n in new.keys() & old.keys() if new[n] != old[n]),
+    }
+
+
+def affected_nodes(old_G, new_G, diff, hops=HOPS):
+    """바뀐 팀과, 새/옛 관계망에서 hops 거리 안에 있는 팀들."""
+    changed = set(diff['added']) | set(diff['removed']) | set(diff['retagged'])
+    affected = set()
+    for G in (old_G, new_G):
+        for node in changed:
+            if node in G:
+                affected.update(nx.single_source_shortest_path_length(G, node, cutoff=hops))
+    # 삭제된 팀은 더 이상 워크의 시작점이 될 수 없다
+    return affected - set(diff['removed'])
+
+
+def incremental_update(model, old_teams, new_teams, hops=HOPS, seed=SEED, max_share=MAX_AFFECTED_SHARE):
+    """
+    바뀐 팀 주변(hops 이내)에서만 워크를 새로 만들어 기존 모델을 이어서 학습한다.
+    영향 범위 밖의 팀 벡터는 lock 을 걸어 그대로 둔다.
+    삭제된 팀은 gensim 어휘에서 지울 수 없으므로 벡터가 남지만 새 워크에는 등장하지 않는다.
+    (model, diff, affected, mode) 를 돌려준다. mode: 'unchanged' / 'incremental' / 'full'
+    - 영향 노드가 전체의 max_share 를 넘으면 전체 재학습('full')으로 전환한다.
+    """
+    diff = catalog_diff(old_teams, new_teams)
+    new_G = build_graph(new_teams)
+    affected = affected_nodes(build_graph(old_teams), new_G, diff, hops)
+    if not affected:
+        return model, diff, affected, 'unchanged'
+    if len(affected) > max_share * max(1, len(new_G)):
+        return train_full(new_teams, seed), diff, affected, 'full'
+
+    walks = random_walks(new_G, sorted(affected), seed=seed)
+    if not walks:
+        return model, diff, affected, 'unchanged'
+    model.build_vocab(walks, update=True)
+
+    # 단어별 학습률 배수: 0.0 이면 갱신 안 됨 (gensim 의 vectors_lockf)
+    lockf = np.zeros(len(model.wv), dtype=np.float32)
+    for node in affected:
+        if node in model.wv.key_to_index:
+            lockf[model.wv.key_to_index[node]] = 1.0
+    model.wv.vectors_lockf = lockf
+    model.train(walks, total_examples=len(walks), epochs=model.epochs)
+    model.wv.vectors_lockf = np.ones(1, dtype=np.float32)
+    return model, diff, affected, 'incremental'
+
+
+# ---------------------------------------------------------
+# 3. 드리프트 리포트 (증분 결과 vs 전체 재학습)
+# ---------------------------------------------------------
+def _top_k(wv, node, nodes, k):
+    sims = [(other, wv.similarity(node, other)) for other in nodes if other != node]
+    return {n for n, _ in sorted(sims, key=lambda x: -x[1])[:k]}
+
+
+def drift_report(old_vectors, inc_model, full_model, teams, affected, k=5):
+    """
+    - stability   : 이전 벡터 vs 증분 후 벡터의 코사인 (영향 밖 팀은 1.0 이어야 함)
+    - overlap@k   : 증분 모델과 전체 재학습 모델의 top-k 이웃 겹침 비율
+      (두 모델의 벡터 공간은 회전이 달라 벡터를 직접 비교하지 않고 이웃 집합을 비교한다)
+    """
+    nodes = [t['team_name'] for t in teams
+             if t['team_name'] in inc_model.wv.key_to_index and t['team_name'] in full_model.wv.key_to_index]
+    # 이웃 후보가 k개보다 적으면 최대 겹침도 그 수뿐이므로 그 수로 나눈다 (같은 모델이면 항상 1.0)
+    denom = max(1, min(k, len(nodes) - 1))
+    groups = {"affected": [], "untouched": []}
+    stability = {"affected": [], "untouched": []}
+    for node in nodes:
+        group = "affected" if node in affected else "untouched"
+        overlap = len(_top_k(inc_model.wv, node, nodes, k) & _top_k(full_model.wv, node, nodes, k)) / denom
+        groups[group].append(overlap)
+        if node in old_vectors:
+            a, b = old_vectors[node], inc_model.wv[node]
+            stability[group].append(float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b))))
+
+    def mean(values):
+        return round(float(np.mean(values)), 4) if values else None
+
+    return {
+        "nodes": len(nodes),
+        "affected": len(groups["affected"]),
+        f"overlap@{k}": {g: mean(v) for g, v in groups.items()},
+        "stability_cosine": {g: mean(v) for g, v in stability.items()},
+    }
+
+
+# ---------------------------------------------------------
+# 4. 저장된 모델이 있으면 증분, 없으면 전체 학습
+# ---------------------------------------------------------
+def update_or_train(teams, model_path='n2v.model', hops=HOPS, seed=SEED, max_share=MAX_AFFECTED_SHARE):
+    """
+    model_path 옆에 학습 당시 팀 스냅샷(.teams)을 두고, 달라진 부분만 반영한다.
+    스냅샷은 JSON 이지만 확장자를 .json 으로 두지 않는다 (팀 JSON 폴더에 섞여 팀 데이터로 읽히지 않도록).
+    """
+    snapshot_path = model_path + '.teams'
+    if os.path.exists(model_path) and os.path.exists(snapshot_path):
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            old_teams = json.load(f)
+        start = time.perf_counter()
+        model, diff, affected, mode = incremental_update(Word2Vec.load(model_path), old_teams, teams,
+                                                         hops, seed, max_share)
+        label = {"unchanged": "변경 없음", "incremental": "증분 학습", "full": "영향 범위가 넓어 전체 재학습"}[mode]
+        print(f"⚙️ Node2Vec {label}: 추가 {len(diff['added'])}, 삭제 {len(diff['removed'])}, "
+              f"태그 변경 {len(diff['retagged'])} -> 영향 노드 {len(affected)}개 ({time.perf_counter() - start:.2f}초)")
+    else:
+        model = train_full(teams, seed)
+        print("⚙️ Node2Vec 전체 학습 완료")
+
+    if model is not None:
+        model.save(model_path)
+        with open(snapshot_path, 'w', encoding='utf-8') as f:
+            json.dump([{"team_name": t['team_name'], "style_tags": t.get('style_tags', [])} for t in teams],
+                      f, ensure_ascii=False)
+    return model
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="카탈로그 변경분에 대한 Node2Vec 증분 학습 + 드리프트 리포트")
+    parser.add_argument('old', help="변경 전 팀 목록 JSON")
+    parser.add_argument('new', help="변경 후 팀 목록 JSON")
+    parser.add_argument('--hops', type=int, default=HOPS)
+    parser.add_argument('--max-share', type=float, default=1.0,
+                        help="영향 노드 비율이 이보다 크면 전체 재학습 (기본 1.0: 비교를 위해 항상 증분)")
+    parser.add_argument('--out', default='n2v_drift_report.json')
+    args = parser.parse_args()
+
+    with open(args.old, 'r', encoding='utf-8') as f:
+        old_teams = json.load(f)
+    with open(args.new, 'r', encoding='utf-8') as f:
+        new_teams = json.load(f)
+
+    model = train_full(old_teams)
+    old_vectors = {k: model.wv[k].copy() for k in model.wv.key_to_index}
+
+    start = time.perf_counter()
+    model, diff, affected, mode = incremental_update(model, old_teams, new_teams, args.hops, max_share=args.max_share)
+    inc_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full = train_full(new_teams)
+    full_s = time.perf_counter() - start
+
+    report = {"diff": diff, "mode": mode, "incremental_s": round(inc_s, 3), "full_retrain_s": round(full_s, 3),
+              **drift_report(old_vectors, model, full, new_teams, affected)}
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
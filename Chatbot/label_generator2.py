@@ -1,18 +1,28 @@
-import json
 import pandas as pd
 import numpy as np
 import os
+import sys
 from sentence_transformers import SentenceTransformer
-from node2vec import Node2Vec
-import networkx as nx
 from sklearn.metrics.pairwise import cosine_similarity
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline_stats import STATS, profile_stage
+from team_catalog import Catalog, filters_from_query
+from incremental_n2v import update_or_train
+from catalog_compiler import load_or_compile
+from training_data import write_training_data
+from scoring_rules import (ALPHA, BETA, DEFAULT_SCORE, RICH_MONEY, UNDERDOG_PENALTY, identity_weight,
+                           is_underdog_query, query_category)
+
 # ---------------------------------------------------------
 # 1. 초기 설정 및 가중치 (최종 튜닝)
 # ---------------------------------------------------------
-ALPHA = 0.7  # Semantic (의미적 유사도)
-BETA = 0.3   # Relational (관계적 유사도 - Anchor Team 기준)
+# ALPHA (Semantic) / BETA (Relational) 및 점수 규칙은 scoring_rules.py (evaluate/team_catalog 와 공용)
 DATA_DIR = r'./' # 실제 JSON 폴더 경로
+# DATA_DIR 안에 있지만 팀 데이터가 아닌 JSON (팀 이름이 겹치는 test.py 용 카탈로그, 다른 스크립트의 출력)
+EXCLUDE_JSON = ['final_team_data3.json', 'paraphrase_cache.json', 'n2v_drift_report.json']
+N2V_MODEL_PATH = 'n2v.model' # 학습된 관계망 (팀 추가/태그 변경 시 바뀐 주변만 증분 학습)
+CATALOG_PATH = 'teams.teamcat' # DATA_DIR 의 JSON 을 컴파일한 바이너리 카탈로그 (JSON 이 바뀌면 자동 재컴파일)
 
 # 모델 로드 (한국어 특화 모델)
 model_nlp = SentenceTransformer('snunlp/KR-SBERT-V40K-klueNLI-augSTS')
@@ -21,36 +31,34 @@ model_nlp = SentenceTransformer('snunlp/KR-SBERT-V40K-klueNLI-augSTS')
 # 2. 데이터 로드 및 관계망 학습
 # ---------------------------------------------------------
 def load_teams(path):
+    # 매번 JSON 을 파싱하지 않고 컴파일된 카탈로그를 mmap 으로 연다 (catalog_compiler.py)
+    # 팀은 읽기 전용 Team 뷰지만 team['team_name'], team.get('scores', {}) 처럼 dict 와 같이 쓸 수 있다
     teams = []
     if os.path.exists(path):
-        for filename in os.listdir(path):
-            if filename.endswith('.json'):
-                with open(os.path.join(path, filename), 'r', encoding='utf-8') as f:
-                    teams.append(json.load(f))
+        teams = list(load_or_compile([path], CATALOG_PATH, exclude=EXCLUDE_JSON))
         print(f"✅ 총 {len(teams)}개의 팀 데이터를 로드했습니다.")
     return teams
 
 def train_node2vec(data):
-    G = nx.Graph()
-    for i in range(len(data)):
-        for j in range(i + 1, len(data)):
-            # 한글 태그 기반 관계망 형성
-            common_tags = set(data[i].get('style_tags', [])) & set(data[j].get('style_tags', []))
-            if common_tags:
-                G.add_edge(data[i]['team_name'], data[j]['team_name'], weight=len(common_tags))
-    if len(G.nodes) == 0: return None
-    node2vec = Node2Vec(G, dimensions=64, walk_length=10, num_walks=40, workers=1)
-    return node2vec.fit(window=5, min_count=1)
-
-teams_data = load_teams(DATA_DIR)
+    # 한글 태그 기반 관계망 형성 + 시드 고정 학습
+    # 저장된 모델이 있으면 바뀐 팀 주변 워크만 다시 만들어 이어서 학습한다 (incremental_n2v.py)
+    return update_or_train(data, N2V_MODEL_PATH)
+
+with STATS.timer('load_teams'):
+    teams_data = load_teams(DATA_DIR)
+    # 리그/종목 샤드 + 태그/점수 역색인 (질문별 후보 팀 사전 필터용)
+    catalog = Catalog.from_teams(teams_data)
 print("⚙️ 관계망(Node2Vec) 학습 중...")
-n2v_model = train_node2vec(teams_data)
+with STATS.timer('train_node2vec'), profile_stage('train_node2vec'):
+    n2v_model = train_node2vec(teams_data)
 
 # ---------------------------------------------------------
 # 3. 고도화된 통합 점수 계산 함수 (버그 수정 포함)
 # ---------------------------------------------------------
-def calculate_integrated_score(anchor_team, user_query, candidate_team, n2v_model):
-    cand_name = candidate_team['team_name']
+def calculate_integrated_score(anchor_team, user_query, candidate_team, n2v_model, category, underdog):
+    # candidate_team 은 컴파일된 카탈로그의 Team 뷰: 점수는 score(key) 로 배열에서 바로 읽는다
+    # category / underdog 은 질문에만 달린 값이라 후보마다 다시 계산하지 않고 시나리오당 한 번 구해 넘긴다
+    cand_name = candidate_team.team_name
 
     # [수정 1] 이름 불일치 해결 (Partial Match)
     # anchor가 "토트넘"이어도 "토트넘 홋스퍼"를 본인으로 인식하도록 개선
@@ -59,39 +67,31 @@ def calculate_integrated_score(anchor_team, user_query, candidate_team, n2v_mode
             return 0.0 # 본인 팀은 추천에서 즉시 제외
 
     # (1) S_semantic: NLP 의미 분석
-    team_tags_str = " ".join(candidate_team.get('style_tags', []))
-    embeddings = model_nlp.encode([user_query, team_tags_str])
-    s_semantic = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
+    with STATS.timer('score.encode'):
+        team_tags_str = " ".join(candidate_team.style_tags)
+        embeddings = model_nlp.encode([user_query, team_tags_str])
+        s_semantic = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
 
     # (2) S_relational: 응원팀과의 그래프 거리
-    s_relational = 0.5 
-    if anchor_team and anchor_team != "None":
-        try:
-            s_relational = n2v_model.wv.similarity(anchor_team, cand_name)
-        except:
-            # 부분 일치하는 다른 이름으로 시도
-            s_relational = 0.5
+    with STATS.timer('score.relational'):
+        s_relational = 0.5 
+        if anchor_team and anchor_team != "None":
+            try:
+                s_relational = n2v_model.wv.similarity(anchor_team, cand_name)
+            except:
+                # 부분 일치하는 다른 이름으로 시도
+                s_relational = 0.5
 
     # (3) W_identity: 질문 기반 정체성 가중치
-    scores = candidate_team.get('scores', {})
-    
-    if any(k in user_query for k in ["자본", "돈", "부자"]): category = 'money'
-    elif any(k in user_query for k in ["언더독", "기적", "약팀", "낭만"]): category = 'underdog_feel'
-    elif any(k in user_query for k in ["역사", "전통", "명문"]): category = 'tradition'
-    elif any(k in user_query for k in ["공격", "화끈"]): category = 'attack_style'
-    elif any(k in user_query for k in ["스타", "개인", "선수"]): category = 'star_power'
-    else: category = 'strength'
-
-    raw_val = scores.get(category, 5) / 10
-    identity_val = raw_val ** 2 
-    w_identity = 0.7 + (identity_val * 0.6)
-
-    # [수정 2] 언더독 질문의 논리 강화 (Hard-coded Penalty)
-    # "언더독" 질문인데 자본력이 8점 이상인 부자 팀은 점수를 강제로 삭감
-    penalty = 1.0
-    if any(k in user_query for k in ["언더독", "기적", "약팀", "낭만"]):
-        if scores.get('money', 0) >= 8:
-            penalty = 0.4 # 부자 강팀 페널티
+    with STATS.timer('score.identity'):
+        w_identity = identity_weight(candidate_team.score(category, DEFAULT_SCORE))
+
+        # [수정 2] 언더독 질문의 논리 강화 (Hard-coded Penalty)
+        # "언더독" 질문인데 자본력이 8점 이상인 부자 팀은 점수를 강제로 삭감
+        penalty = 1.0
+        if underdog:
+            if candidate_team.score('money', 0) >= RICH_MONEY:
+                penalty = UNDERDOG_PENALTY # 부자 강팀 페널티
 
     # 최종 합산
     final_score = ((ALPHA * s_semantic) + (BETA * s_relational)) * w_identity * penalty
@@ -116,18 +116,35 @@ scenarios = [
 dataset = []
 print("\n📊 버그 수정 및 로직 강화 버전 데이터 생성 중...")
 
-for scene in scenarios:
-    anchor = scene['anchor']
-    query = scene['query']
-    for candidate in teams_data:
-        score = calculate_integrated_score(anchor, query, candidate, n2v_model)
-        dataset.append({
-            'anchor_team': anchor,
-            'user_query': query,
-            'team_name': candidate['team_name'],
-            'label_score': score
-        })
+with STATS.timer('label_generation'), profile_stage('label_generation'):
+    for scene in scenarios:
+        anchor = scene['anchor']
+        query = scene['query']
+        category, underdog = query_category(query), is_underdog_query(query)
+        # 종목 조건/언더독 질문이면 해당 후보만 점수 계산 (부자 팀은 애초에 제외)
+        candidate_ids = catalog.candidates(**filters_from_query(query))
+        STATS.count('candidates.scored', len(candidate_ids))
+        STATS.count('candidates.skipped', len(catalog) - len(candidate_ids))
+        for candidate in (catalog.teams[i] for i in sorted(candidate_ids)):
+            score = calculate_integrated_score(anchor, query, candidate, n2v_model, category, underdog)
+            dataset.append({
+                'anchor_team': anchor,
+                'user_query': query,
+                'team_name': candidate.team_name,
+                'label_score': score
+            })
 
 df = pd.DataFrame(dataset)
 df.to_csv('final_training_data_integrated_v2.csv', index=False, encoding='utf-8-sig')
-print("\n✨ 최종 데이터 생성 완료! 'final_training_data_integrated_v2.csv'를 확인하세요.")
\ No newline at end of file
+# 통합 스키마 Parquet 으로도 저장 (training_data.load_training_data 로 읽기)
+is_fan = df['anchor_team'] != "None"
+write_training_data(pd.DataFrame({
+    "user_type": np.where(is_fan, "기존 팬", "입문자"),
+    "query": df['user_query'],
+    "anchor_team": df['anchor_team'].where(is_fan, None),
+    "team_name": df['team_name'],
+    "label_score": df['label_score'],
+    "category": np.where(is_fan, "cross_fan", "narrative"),
+}), "integrated_v2")
+print("\n✨ 최종 데이터 생성 완료! 'final_training_data_integrated_v2.csv'를 확인하세요.")
+STATS.write_report('label_generation')
\ No newline at end of file
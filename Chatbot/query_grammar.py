@@ -0,0 +1,348 @@
+import json
+import os
+import string
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline_stats import STATS
+from training_data import write_training_data
+
+# ---------------------------------------------------------
+# 1. 질문 문법(Grammar) 정의
+# ---------------------------------------------------------
+# 기존 노트북/스크립트(test.py의 universal_needs, 가상질문-추천.ipynb의 score_map,
+# chatbot.ipynb의 other_league_teams)에 흩어져 있던 슬롯을 한 곳에 모은 선언형 문법.
+# - categories : scores 키 -> 그 성향을 표현하는 문구들 ({vibe} 슬롯)
+# - anchors    : 기존 응원팀 -> 그 팀의 성향 점수 ({anchor} 슬롯)
+# - frames     : 사용자 유형 -> 문장 틀. 틀에 들어있는 슬롯만 조합에 참여한다.
+# {tag} 슬롯은 팀 JSON의 style_tags 에서 채워진다.
+DEFAULT_GRAMMAR = {
+    "categories": {
+        "strength": ["강한", "실력 있는", "우승 후보", "압도적인"],
+        "money": ["자본력이 좋은", "돈 많은", "투자를 많이 하는", "재정이 탄탄한", "빅클럽"],
+        "star_power": ["스타 선수가 있는", "유명한", "화려한", "스타 플레이어가 많은", "팬덤이 거대한"],
+        "attack_style": ["공격적인", "화끈한", "속도감 있는", "공격 위주의 전술", "물러서지 않는 플레이"],
+        "underdog_feel": ["언더독", "약팀의 반란", "도전하는", "반란을 꿈꾸는", "스토리가 있는"],
+        "fan_passion": ["팬덤이 뜨거운", "응원이 열정적인", "인기 많은"],
+        "tradition": ["역사가 깊은", "전통 있는", "근본 있는", "명문", "헤리티지가 느껴지는"],
+    },
+    "anchors": {
+        "기아 타이거즈": {"tradition": 10, "fan_passion": 10},
+        "맨체스터 시티": {"strength": 10, "money": 10},
+        "토트넘": {"underdog_feel": 8, "attack_style": 9},
+        "LG 트윈스": {"fan_passion": 9},
+        "한화 이글스": {"underdog_feel": 9, "fan_passion": 10},
+    },
+    "frames": {
+        "입문자": [
+            "저는 {vibe} 팀을 응원하고 싶은데, 저랑 잘 맞는 팀이 있을까요?",
+            "F1 팀 중에서 {vibe} 느낌이 강한 곳 추천 부탁드려요.",
+            "{vibe} 느낌이 나면서 {tag} 같은 면모도 있는 팀이 있을까?",
+            "스포츠는 처음인데, {tag} 느낌 나는 팀이 있을까요?",
+            "{tag} 느낌이랑 {vibe} 분위기 나는 팀 추천해줘.",
+        ],
+        "기존 팬": [
+            "저 {anchor} 팬인데, 비슷한 느낌의 F1 팀 추천해주세요.",
+            "저 {anchor} 팬인데, F1에서도 {vibe} 팀이 있을까요?",
+            "나는 {anchor}의 {vibe} 매력을 좋아해. 여기에 {tag} 느낌까지 더해진 팀이 있을까?",
+        ],
+    },
+}
+
+SLOTS = ("vibe", "tag", "anchor")
+
+
+def load_tags(teams):
+    """팀 데이터에서 중복 없는 style_tags 목록과 태그별 정답 팀 목록을 만든다."""
+    tag_teams = {}
+    for team in teams:
+        for tag in team.get('style_tags', []):
+            tag_teams.setdefault(tag, []).append(team['team_name'])
+    tags = sorted(tag_teams)
+    return tags, [tag_teams[t] for t in tags]
+
+
+def _sorted_unique(ids):
+    # np.unique 보다 정렬 + 인접 비교가 훨씬 빠르다
+    ids = np.sort(ids)
+    keep = np.empty(len(ids), dtype=bool)
+    keep[:1] = True
+    np.not_equal(ids[1:], ids[:-1], out=keep[1:])
+    return ids[keep]
+
+
+# ---------------------------------------------------------
+# 2. 문법 컴파일: 모든 조합에 정수 ID를 부여
+# ---------------------------------------------------------
+class QueryGrammar:
+    """
+    문법의 모든 (문장 틀, 슬롯 값) 조합을 [0, size) 정수 하나로 표현한다.
+    틀마다 사용하는 슬롯의 크기로 혼합 기수(mixed radix)를 만들고, 틀 블록을 이어붙인다.
+    같은 ID는 항상 같은 질문이므로 ID 중복 제거가 곧 질문 중복 제거가 된다.
+    """
+
+    def __init__(self, teams, grammar=DEFAULT_GRAMMAR):
+        self.categories = list(grammar['categories'])
+        # vibe 슬롯은 (카테고리, 문구) 쌍을 펼친 목록
+        self.vibes = [p for c in self.categories for p in grammar['categories'][c]]
+        self.vibe_category = np.array(
+            [i for i, c in enumerate(self.categories) for _ in grammar['categories'][c]],
+            dtype=np.int32)
+        self.tags, self.tag_teams = load_tags(teams)
+        # 태그 슬롯 -> 정답 팀 ("팀1|팀2"), 마지막 칸은 태그 슬롯이 없는 틀(-1)용
+        self._tag_targets = np.array(["|".join(t) for t in self.tag_teams] + [None], dtype=object)
+        self.anchors = list(grammar['anchors'])
+        # 응원팀 슬롯의 정답 성향: 그 팀의 가장 높은 점수 항목 (동점이면 먼저 적힌 항목)
+        anchor_category = []
+        for anchor, scores in grammar['anchors'].items():
+            unknown = set(scores) - set(self.categories)
+            if not scores or unknown:
+                raise ValueError(f"응원팀 점수에 알 수 없는 항목이 있습니다: {anchor} {sorted(unknown)}")
+            anchor_category.append(self.categories.index(max(scores, key=scores.get)))
+        self.anchor_category = np.array(anchor_category, dtype=np.int32)
+        self.slot_values = {"vibe": self.vibes, "tag": self.tags, "anchor": self.anchors}
+        self._slot_arrays = {s: np.array(v, dtype=object) for s, v in self.slot_values.items()}
+        # 같은 문구가 여러 카테고리에 있으면 서로 다른 ID가 같은 문장이 될 수 있다
+        self._needs_text_dedup = any(len(set(v)) < len(v) for v in self.slot_values.values())
+        # 성향 문구 컬럼은 중복 없는 문구 목록을 카테고리로 쓴다 (마지막 칸은 vibe 슬롯이 없는 틀(-1)용)
+        self._vibe_phrases = list(dict.fromkeys(self.vibes))
+        self._vibe_phrase_code = np.array([self._vibe_phrases.index(v) for v in self.vibes] + [-1], dtype=np.int32)
+
+        self.frames, self.user_types = [], []
+        self.user_type_names = list(grammar['frames'])
+        for u, user_type in enumerate(self.user_type_names):
+            for frame in grammar['frames'][user_type]:
+                self.frames.append(frame)
+                self.user_types.append(u)
+
+        # 틀 파싱: 리터럴 조각과 슬롯 순서를 미리 분리해 둔다 (렌더링 시 join 만 수행)
+        self._parts, self._frame_slots = [], []
+        radices = []
+        for frame in self.frames:
+            parts, slots = [], []
+            for literal, field, _, _ in string.Formatter().parse(frame):
+                parts.append(literal)
+                if field is not None:
+                    if field not in SLOTS:
+                        raise ValueError(f"알 수 없는 슬롯입니다: {{{field}}} in '{frame}'")
+                    slots.append(field)
+            self._parts.append(parts)
+            self._frame_slots.append(slots)
+            radices.append([len(self.slot_values[s]) for s in slots])
+
+        self._radices = radices
+        block_sizes = np.array([int(np.prod(r)) if r else 1 for r in radices], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(block_sizes)])
+        self.size = int(self.offsets[-1])
+
+    # -- ID -> 슬롯 인덱스 (벡터화) --------------------------------------
+    def decode(self, ids):
+        """정수 ID 배열을 frame / vibe / tag / anchor 인덱스 배열로 풀어낸다 (없는 슬롯은 -1)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        frame = np.searchsorted(self.offsets, ids, side='right') - 1
+        local = ids - self.offsets[frame]
+        out = {s: np.full(len(ids), -1, dtype=np.int32) for s in SLOTS}
+        for f, (slots, radix) in enumerate(zip(self._frame_slots, self._radices)):
+            mask = frame == f
+            if not mask.any():
+                continue
+            rest = local[mask]
+            # 마지막 슬롯이 가장 빠르게 변하도록 역순으로 나눈다
+            for slot, r in zip(reversed(slots), reversed(radix)):
+                out[slot][mask] = rest % r
+                rest = rest // r
+        out['frame'] = frame.astype(np.int32)
+        return out
+
+    # -- ID 생성 ---------------------------------------------------------
+    def enumerate_ids(self, start=0, stop=None):
+        stop = self.size if stop is None else min(stop, self.size)
+        return np.arange(start, stop, dtype=np.int64)
+
+    def sample_ids(self, n=None, seed=None):
+        """중복 없는 ID n개를 정렬된 상태로 뽑는다. n이 없거나 전체 공간보다 크면 전체를 돌려준다."""
+        if n is None or n >= self.size:
+            return self.enumerate_ids()
+        rng = np.random.default_rng(seed)
+        if n > self.size // 4:
+            return np.sort(rng.choice(self.size, n, replace=False))
+        ids = _sorted_unique(rng.integers(0, self.size, size=n))
+        while len(ids) < n:
+            ids = _sorted_unique(np.concatenate([ids, rng.integers(0, self.size, size=n - len(ids))]))
+        return ids
+
+    # -- 렌더링 ----------------------------------------------------------
+    def render(self, slots):
+        """디코딩된 슬롯 인덱스로 실제 질문 문장을 만든다 (틀 단위로 object 배열을 한 번에 이어붙임)."""
+        frame = slots['frame']
+        out = np.empty(len(frame), dtype=object)
+        for f, (parts, frame_slots) in enumerate(zip(self._parts, self._frame_slots)):
+            mask = frame == f
+            if not mask.any():
+                continue
+            text = np.full(int(mask.sum()), parts[0], dtype=object)
+            for k, s in enumerate(frame_slots):
+                text = text + self._slot_arrays[s][slots[s][mask]] + parts[k + 1]
+            out[mask] = text
+        return out
+
+    def to_frame(self, ids, render=True):
+        """ID 배열을 정답 슬롯 메타데이터가 붙은 DataFrame으로 만든다."""
+        slots = self.decode(ids)
+        anchor_category = np.where(slots['anchor'] >= 0, self.anchor_category[np.maximum(slots['anchor'], 0)], -1)
+        # 성향 문구가 없는 틀("저 {anchor} 팬인데 비슷한 팀")은 응원팀의 성향이 곧 질문의 성향
+        category = np.where(slots['vibe'] >= 0, self.vibe_category[np.maximum(slots['vibe'], 0)], anchor_category)
+        df = pd.DataFrame({
+            "query_id": np.asarray(ids, dtype=np.int64),
+            "frame_id": slots['frame'],
+            "사용자 유형": pd.Categorical.from_codes(
+                np.asarray(self.user_types, dtype=np.int32)[slots['frame']], self.user_type_names),
+            "카테고리": pd.Categorical.from_codes(category, self.categories),
+            "성향 문구": pd.Categorical.from_codes(self._vibe_phrase_code[slots['vibe']], self._vibe_phrases),
+            "태그": pd.Categorical.from_codes(slots['tag'], self.tags),
+            "기존 응원팀": pd.Categorical.from_codes(slots['anchor'], self.anchors),
+            "응원팀 성향": pd.Categorical.from_codes(anchor_category, self.categories),
+            "정답 팀": self._tag_targets[slots['tag']],
+        })
+        if render:
+            df.insert(1, "질문", self.render(slots))
+            if self._needs_text_dedup:
+                df = df.drop_duplicates(subset="질문", keep='first').reset_index(drop=True)
+        return df
+
+    def target_teams(self, tag):
+        """태그 슬롯의 정답 팀 목록 (해당 태그를 가진 팀들)."""
+        return self.tag_teams[self.tags.index(tag)]
+
+    def generate(self, n=None, mode='sample', seed=None, render=True):
+        ids = self.enumerate_ids(stop=n) if mode == 'enumerate' else self.sample_ids(n, seed)
+        df = self.to_frame(ids, render=render)
+        if n is None or len(df) >= n:
+            return df
+
+        # 문장 중복 제거로 n개보다 줄었으면 아직 쓰지 않은 ID로 채운다
+        rng = np.random.default_rng(seed)
+        used = ids
+        while len(df) < n and len(used) < self.size:
+            need = n - len(df)
+            if mode == 'enumerate':
+                extra = self.enumerate_ids(start=len(used), stop=len(used) + need)
+            else:
+                extra = _sorted_unique(rng.integers(0, self.size, size=need))
+                extra = extra[~np.isin(extra, used)]
+            used = np.concatenate([used, extra])
+            df = pd.concat([df, self.to_frame(extra, render=render)], ignore_index=True)
+            df = df.drop_duplicates(subset="질문", keep='first').reset_index(drop=True)
+        if len(df) < n:
+            print(f"⚠️ 중복 없는 질문이 {len(df):,}개뿐이라 요청한 {n:,}개를 채우지 못했습니다.")
+        return df.head(n)
+
+
+def to_training_frame(df):
+    """
+    to_frame 결과를 통합 학습 데이터 스키마(training_data.SCHEMA)로 바꾼다.
+    태그 슬롯이 있는 질문은 정답 팀마다 한 행(is_target=True), 없는 질문은 팀 없이 한 행.
+    """
+    df = df.assign(team_name=df['정답 팀'].str.split('|')).explode('team_name', ignore_index=True)
+    tag = df['태그'].astype(object)
+    vibe_category = df['카테고리'].astype(object)
+    is_fan = (df['사용자 유형'] == "기존 팬").to_numpy()
+    has_tag = tag.notna().to_numpy()
+    return pd.DataFrame({
+        "user_type": df['사용자 유형'].astype(str),
+        "query": df['질문'],
+        "anchor_team": df['기존 응원팀'].astype(object).where(df['기존 응원팀'].notna(), None),
+        "query_tags": [[t] if isinstance(t, str) else [] for t in tag],
+        "score_keys": [[k for k in dict.fromkeys((c, a)) if isinstance(k, str)]
+                       for c, a in zip(vibe_category, df['응원팀 성향'].astype(object))],
+        "team_name": df['team_name'].where(df['team_name'].notna(), None),
+        "is_target": df['team_name'].notna(),
+        "category": np.where(is_fan, "cross_fan", np.where(has_tag, "tag_based", "score_based")),
+    })
+
+
+# ---------------------------------------------------------
+# 3. (선택) LLM 문장 다듬기: 캐시 + 배치 후처리
+# ---------------------------------------------------------
+def paraphrase_queries(queries, model, cache_path='paraphrase_cache.json', batch_size=20):
+    """
+    템플릿 질문을 LLM(Gemini 등)으로 자연스럽게 바꾼다. 생성 경로와 분리된 후처리 단계.
+    - 이미 바꾼 문장은 cache_path 에서 재사용
+    - batch_size 개씩 번호를 붙여 한 번의 호출로 처리
+    - 호출/파싱 실패 시 원래 문장을 그대로 쓴다 (실패 문구를 데이터에 넣지 않음)
+    """
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+
+    todo = [q for q in dict.fromkeys(queries) if q not in cache]
+    STATS.count('llm.cache_hit', len(queries) - len(todo))
+    STATS.count('llm.cache_miss', len(todo))
+    for i in range(0, len(todo), batch_size):
+        batch = todo[i:i + batch_size]
+        prompt = ("다음 질문들을 스포츠 입문자가 말하는 것처럼 자연스러운 한국어 한 문장으로 바꿔줘. "
+                  "번호를 유지하고 한 줄에 하나씩만 답해줘.\n"
+                  + "\n".join(f"{k + 1}. {q}" for k, q in enumerate(batch)))
+        try:
+            with STATS.timer('llm.call'):
+                response = model.generate_content(prompt)
+            lines = [l.strip() for l in response.text.strip().splitlines() if l.strip()]
+            answers = {}
+            for line in lines:
+                num, _, text = line.partition('.')
+                if num.strip().isdigit() and text.strip():
+                    answers[int(num) - 1] = text.strip()
+            for k, q in enumerate(batch):
+                if k in answers:
+                    cache[q] = answers[k]
+        except Exception as e:
+            STATS.count('llm.error')
+            print(f"❌ 문장 다듬기 실패 ({i}~{i + len(batch)}): {e}")
+
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    return [cache.get(q, q) for q in queries]
+
+
+# ---------------------------------------------------------
+# 4. 실행
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="템플릿 문법 기반 가상 질문 생성기")
+    parser.add_argument('--teams', default='final_team_data.json')
+    parser.add_argument('-n', type=int, default=100000)
+    parser.add_argument('--mode', choices=['sample', 'enumerate'], default='sample')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--out', default='grammar_queries.csv')
+    parser.add_argument('--training-data', default='training_data', help="통합 스키마 Parquet 저장 폴더")
+    parser.add_argument('--paraphrase', action='store_true', help="Gemini로 문장 다듬기 (API 키 필요)")
+    args = parser.parse_args()
+
+    with open(args.teams, 'r', encoding='utf-8') as f:
+        teams = json.load(f)
+
+    grammar = QueryGrammar(teams)
+    print(f"✅ 문법 컴파일 완료: 틀 {len(grammar.frames)}개, 태그 {len(grammar.tags)}개, 전체 조합 {grammar.size:,}개")
+
+    start = time.perf_counter()
+    df = grammar.generate(args.n, mode=args.mode, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"⚙️ 질문 {len(df):,}개 생성 ({len(df) / elapsed:,.0f} queries/s)")
+
+    if args.paraphrase:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("api_key"))
+        model = genai.GenerativeModel('gemini-1.5-flash')
+        df['질문'] = paraphrase_queries(df['질문'].tolist(), model)
+        STATS.write_report('query_paraphrase')
+
+    df.to_csv(args.out, index=False, encoding='utf-8-sig')
+    print(f"✨ '{args.out}' 저장 완료!")
+    write_training_data(to_training_frame(df), "grammar_v1", out_dir=args.training_data)
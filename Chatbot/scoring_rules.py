@@ -0,0 +1,45 @@
+# ---------------------------------------------------------
+# 추천 점수 규칙 (label_generator2 / evaluate / team_catalog / catalog_compiler 공용)
+# ---------------------------------------------------------
+# 라벨 생성, 오프라인 평가, 후보 사전 필터가 같은 규칙을 쓰도록 한 곳에 모은다.
+# 무거운 패키지를 import 하지 않으므로 어디서든 가져다 쓸 수 있다.
+#   final = ((ALPHA * S_semantic) + (BETA * S_relational)) * W_identity * penalty
+
+# 팀 JSON 의 scores 항목 (이 순서가 컴파일된 카탈로그 / 점수 행렬의 열 순서)
+SCORE_KEYS = ['strength', 'money', 'star_power', 'attack_style', 'underdog_feel', 'fan_passion', 'tradition']
+MAX_SCORE = 10
+DEFAULT_SCORE = 5  # 팀에 해당 점수가 없을 때
+
+ALPHA = 0.7  # Semantic (의미적 유사도)
+BETA = 0.3   # Relational (관계적 유사도 - Anchor Team 기준)
+
+# 질문 -> W_identity 에 쓸 scores 항목 (위에서부터 우선, 해당 없으면 DEFAULT_CATEGORY)
+CATEGORY_KEYWORDS = [
+    ('money', ["자본", "돈", "부자"]),
+    ('underdog_feel', ["언더독", "기적", "약팀", "낭만"]),
+    ('tradition', ["역사", "전통", "명문"]),
+    ('attack_style', ["공격", "화끈"]),
+    ('star_power', ["스타", "개인", "선수"]),
+]
+DEFAULT_CATEGORY = 'strength'
+
+# 언더독 질문인데 money 가 RICH_MONEY 이상인 부자 팀은 점수에 UNDERDOG_PENALTY 를 곱한다
+UNDERDOG_KEYWORDS = ["언더독", "기적", "약팀", "낭만"]
+RICH_MONEY = 8
+UNDERDOG_PENALTY = 0.4
+
+
+def query_category(user_query):
+    for key, keywords in CATEGORY_KEYWORDS:
+        if any(k in user_query for k in keywords):
+            return key
+    return DEFAULT_CATEGORY
+
+
+def is_underdog_query(user_query):
+    return any(k in user_query for k in UNDERDOG_KEYWORDS)
+
+
+def identity_weight(raw_score):
+    """0~10 점수 -> 0.7~1.3 가중치 (제곱이라 높은 점수일수록 더 크게 반영). numpy 배열도 그대로 받는다."""
+    return 0.7 + ((raw_score / MAX_SCORE) ** 2) * 0.6
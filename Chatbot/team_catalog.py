@@ -0,0 +1,197 @@
+import json
+import os
+import re
+
+from scoring_rules import MAX_SCORE, RICH_MONEY, SCORE_KEYS, is_underdog_query
+
+# ---------------------------------------------------------
+# 1. 리그/종목별 샤드 카탈로그
+# ---------------------------------------------------------
+# catalog/
+#   manifest.json                      <- 샤드 목록 (종목, 리그, 팀 수, 전역 ID 시작값)
+#   모터스포츠/F1.json                  <- 샤드: 팀 목록 + 태그 역색인 + 점수 버킷
+#   축구/EPL.json
+# 질문이 종목/리그를 지정하면 해당 샤드만 읽고, 그 안에서도 역색인으로 후보를 줄인다.
+
+
+def normalize_tag(tag):
+    """'Underdog_Spirit', 'underdog spirit', 'Underdog-Spirit' 을 같은 태그로 본다."""
+    return re.sub(r'[\s_\-]+', '', tag).lower()
+
+
+def _shard_index(teams):
+    """샤드 내부 번호 기준 태그 역색인과 점수 버킷을 만든다."""
+    tag_index = {}
+    buckets = {k: [[] for _ in range(MAX_SCORE + 1)] for k in SCORE_KEYS}
+    for i, team in enumerate(teams):
+        for tag in team.get('style_tags', []):
+            ids = tag_index.setdefault(normalize_tag(tag), [])
+            if not ids or ids[-1] != i:
+                ids.append(i)
+        for key, value in team.get('scores', {}).items():
+            if key in buckets:
+                buckets[key][max(0, min(MAX_SCORE, int(value)))].append(i)
+    return tag_index, buckets
+
+
+def _split_shards(teams):
+    """팀 목록을 (종목, 리그) 샤드로 나눈다. 전역 팀 ID는 샤드 순서대로 이어진다."""
+    shards = {}
+    for team in teams:
+        shards.setdefault((team.get('sport', '기타'), team.get('league', '기타')), []).append(team)
+
+    offset = 0
+    for (sport, league), members in sorted(shards.items()):
+        tag_index, buckets = _shard_index(members)
+        entry = {"sport": sport, "league": league, "path": os.path.join(sport, f"{league}.json"),
+                 "offset": offset, "size": len(members)}
+        yield entry, {"teams": members, "tag_index": tag_index, "score_buckets": buckets}
+        offset += len(members)
+
+
+def build_catalog(teams, out_dir='catalog'):
+    manifest = []
+    for entry, data in _split_shards(teams):
+        os.makedirs(os.path.join(out_dir, entry['sport']), exist_ok=True)
+        with open(os.path.join(out_dir, entry['path']), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        manifest.append(entry)
+
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({"shards": manifest}, f, ensure_ascii=False, indent=2)
+    print(f"✅ 카탈로그 생성: 팀 {sum(e['size'] for e in manifest)}개, 샤드 {len(manifest)}개 -> '{out_dir}'")
+    return out_dir
+
+
+class Catalog:
+    def __init__(self, root, shards):
+        self.root = root
+        self.shards = shards   # 읽어들인 샤드의 manifest 항목
+        self.teams = {}        # 전역 ID -> 팀 dict
+        self.tag_index = {}    # 정규화 태그 -> {전역 ID}
+        self.score_buckets = {k: [set() for _ in range(MAX_SCORE + 1)] for k in SCORE_KEYS}
+        self.by_sport, self.by_league = {}, {}
+
+    @classmethod
+    def from_teams(cls, teams):
+        """디스크에 쓰지 않고 메모리에서 바로 샤드/색인을 만든다."""
+        catalog = cls(None, [])
+        for entry, data in _split_shards(teams):
+            catalog.shards.append(entry)
+            catalog._add_shard(entry, data)
+        return catalog
+
+    def _add_shard(self, entry, data):
+        offset = entry['offset']
+        ids = set(range(offset, offset + entry['size']))
+        for i, team in enumerate(data['teams']):
+            self.teams[offset + i] = team
+        for tag, local_ids in data['tag_index'].items():
+            self.tag_index.setdefault(tag, set()).update(offset + i for i in local_ids)
+        for key, buckets in data['score_buckets'].items():
+            for value, local_ids in enumerate(buckets):
+                self.score_buckets[key][value].update(offset + i for i in local_ids)
+        self.by_sport.setdefault(entry['sport'], set()).update(ids)
+        self.by_league.setdefault(entry['league'], set()).update(ids)
+
+    # -- 역색인 조회 ------------------------------------------------------
+    def with_tag(self, tag):
+        return self.tag_index.get(normalize_tag(tag), set())
+
+    def score_at_least(self, key, value):
+        return set().union(*self.score_buckets[key][max(0, value):])
+
+    def score_below(self, key, value):
+        return set().union(*self.score_buckets[key][:max(0, value)])
+
+    def candidates(self, sport=None, league=None, tags=None, max_money=None):
+        """
+        조건에 맞는 팀 ID 집합. 조건이 없으면 읽어들인 전체 팀.
+        - sport / league : 해당 샤드의 팀만
+        - tags           : 태그 중 하나라도 가진 팀만
+        - max_money      : money 점수가 이 값 미만인 팀만 (언더독 질문의 부자 팀 제외)
+        카탈로그에 없는 종목/리그 조건은 무시한다 (아직 수집하지 않은 종목일 수 있으므로).
+        """
+        result = None
+
+        def narrow(ids):
+            nonlocal result
+            result = set(ids) if result is None else result & ids
+
+        if sport in self.by_sport:
+            narrow(self.by_sport[sport])
+        if league in self.by_league:
+            narrow(self.by_league[league])
+        if tags:
+            narrow(set().union(*(self.with_tag(t) for t in tags)))
+        if max_money is not None:
+            if result is None:
+                # money 점수가 없는 팀도 남긴다 (페널티 대상은 money >= max_money 뿐)
+                result = set(self.teams) - self.score_at_least('money', max_money)
+            else:
+                # 이미 후보가 좁혀졌으면 버킷 합집합 대신 후보만 검사 (후보 수에 비례)
+                result = {i for i in result if self.teams[i].get('scores', {}).get('money', 0) < max_money}
+        return set(self.teams) if result is None else result
+
+    def __len__(self):
+        return len(self.teams)
+
+
+def load_catalog(root='catalog', sport=None, league=None):
+    """manifest 를 보고 필요한 샤드만 읽는다. sport/league 는 값 하나 또는 목록."""
+    with open(os.path.join(root, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)['shards']
+
+    def wanted(value, condition):
+        if condition is None:
+            return True
+        return value in ([condition] if isinstance(condition, str) else condition)
+
+    shards = [e for e in manifest if wanted(e['sport'], sport) and wanted(e['league'], league)]
+    catalog = Catalog(root, shards)
+    for entry in shards:
+        with open(os.path.join(root, entry['path']), 'r', encoding='utf-8') as f:
+            catalog._add_shard(entry, json.load(f))
+    print(f"✅ 카탈로그 로드: 샤드 {len(shards)}/{len(manifest)}개, 팀 {len(catalog)}개")
+    return catalog
+
+
+# ---------------------------------------------------------
+# 2. 질문 -> 사전 필터 조건
+# ---------------------------------------------------------
+SPORT_KEYWORDS = {
+    "축구": ("sport", "축구"), "야구": ("sport", "야구"), "모터스포츠": ("sport", "모터스포츠"),
+    "F1": ("league", "F1"), "포뮬러": ("league", "F1"),
+    "EPL": ("league", "EPL"), "프리미어리그": ("league", "EPL"),
+    "KBO": ("league", "KBO"),
+}
+
+
+def filters_from_query(user_query):
+    filters = {}
+    for keyword, (field, value) in SPORT_KEYWORDS.items():
+        if keyword in user_query and field not in filters:
+            filters[field] = value
+    # 언더독 질문이면 페널티 대상인 부자 팀(money >= RICH_MONEY)은 후보에서 뺀다
+    if is_underdog_query(user_query):
+        filters['max_money'] = RICH_MONEY
+    return filters
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="팀 JSON -> 리그/종목 샤드 카탈로그")
+    parser.add_argument('teams', nargs='+', help="팀 목록 JSON 또는 팀별 JSON 이 들어있는 폴더")
+    parser.add_argument('--out', default='catalog')
+    args = parser.parse_args()
+
+    teams = []
+    for path in args.teams:
+        files = [os.path.join(path, n) for n in sorted(os.listdir(path)) if n.endswith('.json')] \
+            if os.path.isdir(path) else [path]
+        for file in files:
+            with open(file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            teams.extend(data if isinstance(data, list) else [data])
+    build_catalog(teams, args.out)
@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from catalog_compiler import load_or_compile
+from incremental_n2v import update_or_train
+
+SCORES = {'strength': 5, 'money': 3, 'star_power': 4, 'attack_style': 6, 'underdog_feel': 7,
+          'fan_passion': 8, 'tradition': 2}
+
+
+def _team(name, tags):
+    return {"league": "F1", "sport": "모터스포츠", "team_name": name, "home_city": None, "home_stadium": None,
+            "founded_year": 1990, "style_tags": tags, "scores": dict(SCORES), "meta_description": ""}
+
+
+def _write_teams(data_dir, teams):
+    for team in teams:
+        with open(os.path.join(data_dir, f"{team['team_name']}.json"), 'w', encoding='utf-8') as f:
+            json.dump(team, f, ensure_ascii=False)
+
+
+def test_load_and_train_twice(tmp_path, monkeypatch):
+    # label_generator2 처럼 팀 JSON 폴더 = 작업 폴더 = 모델 저장 위치
+    monkeypatch.chdir(tmp_path)
+    _write_teams(tmp_path, [_team("A", ["x", "y"]), _team("B", ["y", "z"]), _team("C", ["x", "z"])])
+
+    for _ in range(2):
+        teams = list(load_or_compile(['.'], 'teams.teamcat'))
+        assert sorted(t['team_name'] for t in teams) == ["A", "B", "C"]
+        assert update_or_train(teams, 'n2v.model') is not None
+
+
+def test_recompiles_when_source_removed_or_older(tmp_path):
+    _write_teams(tmp_path, [_team("A", ["x"]), _team("B", ["x"])])
+    artifact = str(tmp_path / 'teams.teamcat')
+    assert len(load_or_compile([str(tmp_path)], artifact)) == 2
+
+    os.remove(tmp_path / 'B.json')
+    assert len(load_or_compile([str(tmp_path)], artifact)) == 1
+
+    # 더 오래된 mtime 의 파일로 되돌려도 다시 컴파일되어야 한다
+    _write_teams(tmp_path, [_team("A", ["old"])])
+    os.utime(tmp_path / 'A.json', ns=(1, 1))
+    assert load_or_compile([str(tmp_path)], artifact)[0]['style_tags'] == ("old",)
+
+
+def test_rejects_duplicate_team_names(tmp_path):
+    with open(tmp_path / 'teams.json', 'w', encoding='utf-8') as f:
+        json.dump([_team("A", ["x"]), _team("A", ["y"])], f)
+    with pytest.raises(ValueError, match="중복"):
+        load_or_compile([str(tmp_path / 'teams.json')], str(tmp_path / 'teams.teamcat'))
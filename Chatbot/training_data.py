@@ -0,0 +1,275 @@
+import ast
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# ---------------------------------------------------------
+# 1. 통합 학습 데이터 스키마
+# ---------------------------------------------------------
+# 생성기마다 컬럼 이름이 달랐던 라벨 CSV들을 하나의 스키마로 모은다.
+# - 팀 이름/사용자 유형/태그처럼 반복되는 문자열은 dictionary 인코딩
+# - 태그 목록은 "['a', 'b']" 문자열 대신 list 컬럼 (원소도 dictionary 인코딩)
+# - generator_version / category 로 파티션을 나눠 필요한 부분만 읽는다
+DICT_STR = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema([
+    ("user_type", DICT_STR),                # 입문자 / 기존 팬
+    ("query", pa.string()),                 # 사용자 질문
+    ("anchor_team", DICT_STR),              # 기존 응원팀 (없으면 null)
+    ("anchor_tags", pa.list_(DICT_STR)),    # 기존 응원팀 태그
+    ("query_tags", pa.list_(DICT_STR)),     # 질문에 쓰인 style_tags
+    ("score_keys", pa.list_(pa.string())),  # 질문이 겨냥한 scores 항목
+    ("team_name", DICT_STR),                # 비교/정답 팀
+    ("label_score", pa.float32()),          # 유사도 점수 (정답 팀만 있는 데이터는 null)
+    ("is_target", pa.bool_()),              # 질문의 정답 팀 행인지
+    ("generator_version", pa.string()),     # 파티션 1
+    ("category", pa.string()),              # 파티션 2: tag_based / narrative / cross_fan / score_based
+])
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("generator_version", pa.string()), ("category", pa.string())]), flavor="hive")
+
+NO_ANCHOR = ("None", "없음", "0", "")
+
+
+def _split_tags(value):
+    """'a, b' 형식의 문자열을 리스트로."""
+    if not isinstance(value, str) or not value.strip():
+        return []
+    return [t.strip() for t in value.split(',') if t.strip()]
+
+
+def _literal_list(value):
+    """"['a', 'b']" 형식(파이썬 리스트 문자열)을 리스트로. 입문자는 0 이 들어있다."""
+    if not isinstance(value, str) or not value.startswith('['):
+        return []
+    return list(ast.literal_eval(value))
+
+
+def _anchor(value):
+    return None if pd.isna(value) or str(value) in NO_ANCHOR else str(value)
+
+
+# ---------------------------------------------------------
+# 2. 기존 CSV -> 통합 스키마 변환기
+# ---------------------------------------------------------
+def _from_nuanced(df):
+    keys = df['focused_scores'].map(_split_tags)
+    return pd.DataFrame({
+        "user_type": "입문자",
+        "query": df['user_query'],
+        "anchor_team": None,
+        "anchor_tags": [[] for _ in range(len(df))],
+        "query_tags": [[] for _ in range(len(df))],
+        "score_keys": keys,
+        "team_name": df['team_name'],
+        "label_score": df['label_score'],
+        "is_target": False,
+        "category": "score_based",
+    })
+
+
+def _from_synthetic_test(df):
+    return pd.DataFrame({
+        "user_type": "입문자",
+        "query": df['user_say'],
+        "anchor_team": None,
+        "anchor_tags": [[] for _ in range(len(df))],
+        "query_tags": df['tags_used'].map(_split_tags),
+        "score_keys": [[] for _ in range(len(df))],
+        "team_name": df['team_name'],
+        "label_score": df['score'],
+        "is_target": False,
+        "category": "tag_based",
+    })
+
+
+def _from_synthetic_queries(df):
+    return pd.DataFrame({
+        "user_type": df['category'].map(lambda c: "기존 팬" if c == "cross_fan" else "입문자"),
+        "query": df['user_query'],
+        "anchor_team": None,
+        "anchor_tags": [[] for _ in range(len(df))],
+        "query_tags": [[] for _ in range(len(df))],
+        "score_keys": [[] for _ in range(len(df))],
+        "team_name": df['target_team'],
+        "label_score": None,
+        "is_target": True,
+        "category": df['category'],
+    })
+
+
+def _from_unified_logic(df):
+    user_type = df['사용자 유형']
+    return pd.DataFrame({
+        "user_type": user_type,
+        "query": df['질문'],
+        "anchor_team": df['기존 응원팀'].map(_anchor),
+        "anchor_tags": df['입력 변수(기존팀 태그)'].map(_literal_list),
+        "query_tags": df['입력 변수(사용자 취향)'].map(lambda t: [t] if isinstance(t, str) else []),
+        "score_keys": [[] for _ in range(len(df))],
+        "team_name": df['정답 팀'],
+        "label_score": df['유사도 점수'],
+        "is_target": True,
+        "category": user_type.map(lambda u: "cross_fan" if u == "기존 팬" else "tag_based"),
+    })
+
+
+def _from_integrated(df):
+    anchor = df['anchor_team'].map(_anchor)
+    return pd.DataFrame({
+        "user_type": anchor.map(lambda a: "입문자" if a is None else "기존 팬"),
+        "query": df['user_query'],
+        "anchor_team": anchor,
+        "anchor_tags": [[] for _ in range(len(df))],
+        "query_tags": [[] for _ in range(len(df))],
+        "score_keys": [[] for _ in range(len(df))],
+        "team_name": df['team_name'],
+        "label_score": df['label_score'],
+        "is_target": False,
+        "category": anchor.map(lambda a: "narrative" if a is None else "cross_fan"),
+    })
+
+
+# 파일 이름 -> (generator_version, 변환 함수)
+CONVERTERS = {
+    "nuanced_score_data.csv": ("nuanced_v1", _from_nuanced),
+    "synthetic_test_data.csv": ("synthetic_test_v1", _from_synthetic_test),
+    "synthetic_user_queries.csv": ("synthetic_queries_v1", _from_synthetic_queries),
+    "unified_logic_test_data.csv": ("unified_logic_v1", _from_unified_logic),
+    "final_training_data_integrated_v2.csv": ("integrated_v2", _from_integrated),
+}
+
+
+def convert_csv(path):
+    name = os.path.basename(path)
+    if name not in CONVERTERS:
+        raise ValueError(f"변환 규칙이 없는 파일입니다: {name}")
+    version, convert = CONVERTERS[name]
+    df = convert(pd.read_csv(path, encoding='utf-8-sig'))
+    df['generator_version'] = version
+    return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+
+# 통합 스키마에서 생성기가 채우지 않아도 되는 컬럼의 기본값
+DEFAULTS = {
+    "user_type": None, "anchor_team": None, "anchor_tags": list, "query_tags": list, "score_keys": list,
+    "team_name": None, "label_score": None, "is_target": False,
+}
+
+
+def _write_table(table, out_dir):
+    # 같은 (generator_version, category) 파티션만 교체하고 나머지 파티션은 그대로 둔다
+    ds.write_dataset(
+        table, out_dir, format="parquet", partitioning=PARTITIONING,
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+    )
+
+
+def write_training_data(df, generator_version, category=None, out_dir='training_data'):
+    """
+    생성기가 만든 DataFrame 을 통합 스키마 Parquet 파티션으로 저장한다.
+    - df 에 없는 컬럼은 DEFAULTS 로 채운다 (리스트 컬럼은 빈 리스트)
+    - category 를 주면 모든 행에 쓰고, 아니면 df['category'] 를 그대로 쓴다
+    """
+    df = df.copy()
+    for column, default in DEFAULTS.items():
+        if column not in df:
+            df[column] = [default() for _ in range(len(df))] if callable(default) else default
+    if category is not None:
+        df['category'] = category
+    df['generator_version'] = generator_version
+    table = pa.Table.from_pandas(df[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+    _write_table(table, out_dir)
+    print(f"✨ {generator_version}: {table.num_rows}행을 '{out_dir}' 에 저장했습니다.")
+    return out_dir
+
+
+def migrate(csv_dir='./', out_dir='training_data'):
+    """csv_dir 의 라벨 CSV들을 out_dir 아래 파티션 Parquet 으로 변환한다."""
+    tables = []
+    for name in CONVERTERS:
+        path = os.path.join(csv_dir, name)
+        if os.path.exists(path):
+            tables.append(convert_csv(path))
+            print(f"✅ {name}: {tables[-1].num_rows}행 변환")
+    if not tables:
+        print("❌ 변환할 CSV가 없습니다.")
+        return None
+
+    table = pa.concat_tables(tables)
+    _write_table(table, out_dir)
+    print(f"✨ 총 {table.num_rows}행을 '{out_dir}' 에 저장했습니다.")
+    return out_dir
+
+
+# ---------------------------------------------------------
+# 3. 로더: 필요한 컬럼/파티션만 memory-map 으로 읽기
+# ---------------------------------------------------------
+def load_training_data(root='training_data', columns=None, generator_version=None, category=None,
+                       to_pandas=True):
+    """
+    예) load_training_data(columns=['query', 'team_name', 'label_score'], category='tag_based')
+    파티션 조건은 디렉터리 단위로 걸러지므로 해당 파일만 열린다.
+    """
+    filters = []
+    for key, value in (("generator_version", generator_version), ("category", category)):
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            filters.append((key, "in", list(value)))
+        else:
+            filters.append((key, "=", value))
+
+    table = pq.read_table(root, columns=columns, filters=filters or None,
+                          partitioning=PARTITIONING, memory_map=True)
+    return table.to_pandas() if to_pandas else table
+
+
+# ---------------------------------------------------------
+# 4. CSV 대비 로딩 시간 비교
+# ---------------------------------------------------------
+def benchmark(csv_dir='./', root='training_data', repeat=5):
+    def load_csvs():
+        # 기존 방식: 전체 CSV 파싱 + 리스트 문자열 복원
+        for name in CONVERTERS:
+            path = os.path.join(csv_dir, name)
+            if os.path.exists(path):
+                df = pd.read_csv(path, encoding='utf-8-sig')
+                if '입력 변수(기존팀 태그)' in df:
+                    df['입력 변수(기존팀 태그)'].map(_literal_list)
+
+    cases = {
+        "CSV 전체": load_csvs,
+        "Parquet 전체": lambda: load_training_data(root),
+        "Parquet 3개 컬럼": lambda: load_training_data(root, columns=['query', 'team_name', 'label_score']),
+        "Parquet tag_based 파티션": lambda: load_training_data(root, category='tag_based'),
+    }
+    results = {}
+    for label, fn in cases.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        results[label] = (time.perf_counter() - start) / repeat * 1000
+        print(f"⏱️ {label}: {results[label]:.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="라벨 CSV -> 파티션 Parquet 변환 및 로딩 벤치마크")
+    parser.add_argument('command', choices=['migrate', 'bench'])
+    parser.add_argument('--csv-dir', default='./')
+    parser.add_argument('--out', default='training_data')
+    args = parser.parse_args()
+
+    if args.command == 'migrate':
+        migrate(args.csv_dir, args.out)
+    else:
+        benchmark(args.csv_dir, args.out)
@@ -0,0 +1,295 @@
+import hashlib
+import os
+import queue
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# ---------------------------------------------------------
+# 1. 크롤러 출력(txt) 읽기
+# ---------------------------------------------------------
+# 크롤러들은 아래 형식으로 파일을 저장한다.
+#   URL: https://...
+#
+#   팀 이름: McLaren
+#   ========== TEAM NARRATIVE DATA (...) ==========
+#   본문...
+# 헤더가 없는 파일(예: jeju_utd.txt, wiki_crawler 출력)은 파일 이름에서 팀 이름을 얻는다.
+COLUMNS = ("team_id", "team_name", "league", "soruce_url", "raw_text", "collected_at", "content_hash")
+# 파일 이름 규칙: {team_key}_{source}_data.txt / {team_key}_namuwiki_season.txt / {team_key}.txt
+# team_key 자체에 '_' 가 들어가므로 (Scuderia_Ferrari) 끝의 _{source}_data 부분만 떼어낸다.
+FILENAME_SUFFIX = re.compile(r'_[^_]+_(?:data|season)$')
+
+
+def content_hash(team_name, url, body):
+    """
+    유니크 키. 본문만 해시하면 본문이 같은 다른 팀 문서(빈 문서 포함)가 한 행으로 합쳐지므로
+    팀 이름과 출처 URL 까지 함께 해시한다.
+    """
+    key = '\x1f'.join([team_name or '', url or '', body])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def split_header(text):
+    """크롤러 헤더를 떼어내 (url, team_name, 본문) 을 돌려준다. 본문은 앞뒤 공백/줄바꿈을 제거한다."""
+    url, team_name, body = None, None, text
+    head, sep, rest = text.partition('==========')
+    # 구분선 앞이 헤더 줄(URL: / 팀 이름:)로만 이루어져 있으면 헤더로 본다.
+    # namu_season_crawler 처럼 URL 줄 없이 "팀 이름:" 으로 시작하는 파일도 있다.
+    head_lines = [l for l in head.splitlines() if l.strip()]
+    if sep and head_lines and all(l.startswith(('URL:', '팀 이름:')) for l in head_lines):
+        for line in head_lines:
+            if line.startswith('URL:'):
+                url = line[len('URL:'):].strip()
+            elif line.startswith('팀 이름:'):
+                team_name = line[len('팀 이름:'):].strip()
+        # 구분선(===== ... =====) 다음 줄부터가 본문
+        body = rest.partition('\n')[2]
+    return url, team_name, body.strip()
+
+
+def parse_crawled_file(path, league=None, team_ids=None):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    url, team_name, body = split_header(text)
+    if not team_name:
+        team_name = FILENAME_SUFFIX.sub('', os.path.splitext(os.path.basename(path))[0])
+
+    collected_at = datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d %H:%M:%S')
+    team_id = (team_ids or {}).get(team_name)
+    return (team_id, team_name, league, url, body, collected_at, content_hash(team_name, url, body))
+
+
+def iter_crawled_docs(paths, league=None, team_ids=None):
+    """
+    파일/폴더 경로들을 받아 Crawl_db 한 행씩 스트리밍한다 (메모리에 전부 올리지 않음).
+    본문이 비어있는 파일(크롤링 실패)은 적재하지 않는다.
+    """
+    for path in paths:
+        files = [path]
+        if os.path.isdir(path):
+            files = [os.path.join(root, filename)
+                     for root, _, names in os.walk(path) for filename in sorted(names) if filename.endswith('.txt')]
+        for file in files:
+            row = parse_crawled_file(file, league, team_ids)
+            if not row[4]:
+                print(f"⚠️ 본문이 비어있어 건너뜁니다: {file}")
+                continue
+            yield row
+
+
+# ---------------------------------------------------------
+# 2. 커넥션 풀
+# ---------------------------------------------------------
+class ConnectionPool:
+    """
+    connect_fn 으로 만든 커넥션을 재사용하는 간단한 풀.
+    pymysql(팀 서버)과 sqlite3(로컬 테스트) 모두 같은 방식으로 쓴다.
+    """
+
+    def __init__(self, connect_fn, size=4):
+        self._connect_fn = connect_fn
+        self._pool = queue.LifoQueue(maxsize=size)
+        self._size = size
+        self._created = 0
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            if self._created < self._size:
+                conn = self._connect_fn()
+                self._created += 1
+            else:
+                conn = self._pool.get()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        self._created = 0
+
+
+def mysql_pool(size=4, host=None, port=3306, user='sbunpa', password=None, db='S-Bun-Pa'):
+    """기본값은 팀 DB. 로컬 MySQL 컨테이너로 테스트할 때는 host/port/password 만 바꿔준다."""
+    import pymysql
+
+    def connect():
+        return pymysql.connect(
+            host=host or os.getenv('team_ip'),
+            port=port,
+            user=user,
+            password=password or os.getenv('team_password'),
+            db=db,
+            charset='utf8mb4'
+        )
+    return ConnectionPool(connect, size)
+
+
+def sqlite_pool(path, size=1):
+    return ConnectionPool(lambda: sqlite3.connect(path, check_same_thread=False), size)
+
+
+# ---------------------------------------------------------
+# 3. 스키마 & 업서트 SQL
+# ---------------------------------------------------------
+# content_hash 유니크 키 덕분에 같은 문서를 다시 넣어도 행이 늘어나지 않는다.
+# 기존 팀 서버 테이블에는 migrate_mysql() (CLI: --migrate) 을 한 번 실행해 둔다.
+# 이미 들어있는 행의 해시는 SQL(SHA2/TRIM)이 아니라 로더와 같은 파이썬 정규화(split_header,
+# content_hash)로 채운다. TRIM 은 공백만 지우고 헤더도 남겨두므로 해시가 달라져 재적재 시 중복이 생긴다.
+MYSQL_ADD_HASH_COLUMN = "ALTER TABLE Crawl_db ADD COLUMN content_hash CHAR(64) NULL"
+MYSQL_ADD_UNIQUE_KEY = ("ALTER TABLE Crawl_db MODIFY content_hash CHAR(64) NOT NULL, "
+                        "ADD UNIQUE KEY uq_crawl_content_hash (content_hash)")
+
+
+def backfill_hashes(conn, dialect='mysql'):
+    """content_hash 가 비어있는 기존 행의 해시를 로더와 같은 방식으로 계산해 채운다."""
+    mark = '%s' if dialect == 'mysql' else '?'
+    same = '<=>' if dialect == 'mysql' else 'IS'  # NULL 도 같은 값으로 비교
+    cursor = conn.cursor()
+    cursor.execute("SELECT DISTINCT team_name, soruce_url, raw_text FROM Crawl_db WHERE content_hash IS NULL")
+    updates = []
+    for team_name, url, raw_text in cursor.fetchall():
+        header_url, header_team, body = split_header(raw_text or '')
+        updates.append((content_hash(team_name or header_team, url or header_url, body), team_name, url, raw_text))
+    cursor.executemany(
+        f"UPDATE Crawl_db SET content_hash = {mark} WHERE content_hash IS NULL "
+        f"AND team_name {same} {mark} AND soruce_url {same} {mark} AND raw_text {same} {mark}", updates)
+    conn.commit()
+
+    cursor.execute("SELECT content_hash, COUNT(*) FROM Crawl_db GROUP BY content_hash HAVING COUNT(*) > 1")
+    duplicates = cursor.fetchall()
+    cursor.close()
+    return len(updates), duplicates
+
+
+def migrate_mysql(pool):
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(MYSQL_ADD_HASH_COLUMN)
+        conn.commit()
+        filled, duplicates = backfill_hashes(conn, 'mysql')
+        print(f"✅ 기존 문서 {filled}건의 content_hash 를 채웠습니다.")
+        if duplicates:
+            # 같은 문서가 이미 여러 행 있으면 유니크 키를 걸 수 없으므로 먼저 정리해야 한다
+            raise ValueError(f"content_hash 가 중복된 행이 {len(duplicates)}종류 있습니다. 정리 후 다시 실행하세요: "
+                             f"{[h for h, _ in duplicates[:5]]}")
+        cursor.execute(MYSQL_ADD_UNIQUE_KEY)
+        conn.commit()
+        cursor.close()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Crawl_db (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    team_id INTEGER,
+    team_name TEXT,
+    league TEXT,
+    soruce_url TEXT,
+    raw_text TEXT,
+    collected_at TEXT,
+    content_hash TEXT NOT NULL UNIQUE
+)
+"""
+
+
+def build_upsert_sql(dialect, n_rows):
+    """
+    n_rows 행을 한 번에 넣는 multi-row INSERT (중복 content_hash 는 갱신).
+    새 값이 NULL 인 컬럼은 기존 값을 유지한다 (--league 없이 다시 적재해도 league 가 지워지지 않음).
+    """
+    mark = '%s' if dialect == 'mysql' else '?'
+    row = '(' + ', '.join([mark] * len(COLUMNS)) + ')'
+    sql = f"INSERT INTO Crawl_db ({', '.join(COLUMNS)}) VALUES " + ', '.join([row] * n_rows)
+    updated = [c for c in COLUMNS if c != 'content_hash']
+    if dialect == 'mysql':
+        sql += " ON DUPLICATE KEY UPDATE " + ', '.join(f"{c} = COALESCE(VALUES({c}), {c})" for c in updated)
+    else:
+        sql += " ON CONFLICT(content_hash) DO UPDATE SET " + ', '.join(f"{c} = COALESCE(excluded.{c}, {c})" for c in updated)
+    return sql
+
+
+# ---------------------------------------------------------
+# 4. 벌크 로더
+# ---------------------------------------------------------
+def bulk_load(rows, pool, dialect='mysql', batch_size=500, commit_every=10):
+    """
+    rows(iterable)를 batch_size 행씩 묶어 multi-row upsert 로 넣고,
+    commit_every 배치마다 커밋한다. 적재한 행 수와 rows/s 를 돌려준다.
+    """
+    sql_cache = {}
+    total, batches = 0, 0
+    start = time.perf_counter()
+
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+
+        def flush(batch):
+            n = len(batch)
+            if n not in sql_cache:
+                sql_cache[n] = build_upsert_sql(dialect, n)
+            cursor.execute(sql_cache[n], [v for row in batch for v in row])
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                flush(batch)
+                total += len(batch)
+                batches += 1
+                batch = []
+                if batches % commit_every == 0:
+                    conn.commit()
+        if batch:
+            flush(batch)
+            total += len(batch)
+        conn.commit()
+        cursor.close()
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"✅ Crawl_db 적재 완료: {total}행, {elapsed:.2f}초 ({rate:,.0f} rows/s)")
+    return total, rate
+
+
+# ---------------------------------------------------------
+# 5. 실행
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="크롤링 결과를 Crawl_db 로 일괄 적재")
+    parser.add_argument('paths', nargs='+', help="크롤러 출력 txt 파일 또는 폴더")
+    parser.add_argument('--league', default=None)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--commit-every', type=int, default=10)
+    parser.add_argument('--sqlite', default=None, help="팀 서버 대신 사용할 SQLite 파일 경로")
+    parser.add_argument('--host', default=None, help="팀 서버 대신 사용할 MySQL 호스트 (예: 로컬 컨테이너)")
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--migrate', action='store_true', help="기존 MySQL 테이블에 content_hash 컬럼/유니크 키 추가 (최초 1회)")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        pool, dialect = sqlite_pool(args.sqlite), 'sqlite'
+        with pool.connection() as conn:
+            conn.execute(SQLITE_SCHEMA)
+    else:
+        pool, dialect = mysql_pool(host=args.host, port=args.port), 'mysql'
+        if args.migrate:
+            migrate_mysql(pool)
+
+    try:
+        bulk_load(iter_crawled_docs(args.paths, league=args.league), pool, dialect,
+                  batch_size=args.batch_size, commit_every=args.commit_every)
+    finally:
+        pool.close()
@@ -3,6 +3,9 @@ from playwright.async_api import async_playwright, TimeoutError
 from bs4 import BeautifulSoup
 import os
 import time
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline_stats import STATS
 
 f1_teams = {
     "Scuderia_Ferrari": "https://www.formula1.com/en/information/ferrari-year-by-year.61yfcjhl05vSlmNJB1SIJ0",
@@ -32,6 +35,7 @@ async def crawl_and_save_text(team_key, url):
             try:
                 print(f"[ {source} ]에서 [ {team_key} ] 데이터 크롤링")
                 
+                fetch_start = time.perf_counter()
                 response = await page.goto(url, timeout=30000)
                 if response is None or response.status >= 400:
                     raise Exception(f"❌ HTTP 요청 실패: {response.status if response else 'N/A'}")
@@ -54,6 +58,7 @@ async def crawl_and_save_text(team_key, url):
                 await page.wait_for_selector('#maincontent', state='attached', timeout=60000) 
                 
                 html_content = await page.content()
+                STATS.record('crawl.f1com.fetch', time.perf_counter() - fetch_start)
 
                 print(f"👍 [{team_key}] 페이지 로딩 성공")
                 
@@ -71,6 +76,7 @@ async def crawl_and_save_text(team_key, url):
                 print(f"❌ [{team_key}] HTML 콘텐츠를 찾을 수 없습니다.")
                 return None
 
+            parse_start = time.perf_counter()
             soup = BeautifulSoup(html_content, 'html.parser')
             
             # 가장 안정적인 부모 컨테이너 찾기
@@ -100,6 +106,9 @@ async def crawl_and_save_text(team_key, url):
                             extracted_text.append(text)                    
                 # print(extracted_text)
 
+            STATS.record('crawl.f1com.parse', time.perf_counter() - parse_start,
+                         nbytes=len(html_content.encode('utf-8')))
+
             # 결과를 TXT 파일로 저장
             full_path = os.path.join(output_dir, file_name)
 
@@ -110,6 +119,7 @@ async def crawl_and_save_text(team_key, url):
                 f.write('\n'.join(extracted_text))
             
             print(f"✅ [{team_key}] 데이터 크롤링 및 저장이 완료되었습니다: {full_path}")
+            STATS.count('crawl.f1com.ok')
             return full_path
 
     except Exception as e:
@@ -118,6 +128,7 @@ async def crawl_and_save_text(team_key, url):
             await browser.close() 
         except:
             pass
+        STATS.count('crawl.f1com.fail')
         print(f"❌ [{team_key}] 크롤링 중 예외 발생: {e}")
         return None
 
@@ -136,6 +147,7 @@ async def main_async():
     await asyncio.gather(*tasks) 
     
     print("\n모든 팀에 대한 크롤링 작업이 완료되었습니다.")
+    STATS.write_report('crawl_f1com')
 
 if __name__ == "__main__":
     # asyncio.run()은 최상위 비동기 함수(main_async)만 실행한다.
@@ -3,6 +3,9 @@ from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 import os
 import time
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline_stats import STATS
 from urllib.parse import unquote
 
 # async 사용
@@ -17,9 +20,11 @@ async def crawl_and_save_namuwiki_text(team_key, url):
         page = await browser.new_page()
         
         try:
+            fetch_start = time.perf_counter()
             response = await page.goto(url)
             if response is None or response.status >= 400:
                 print(f"❌ [{team_key}] HTTP 요청 실패: {response.status if response else 'N/A'}")
+                STATS.count('crawl.namu.fail')
                 return None
             
             # '개요' 섹션의 h2 태그가 나타날 때까지 기다린다.
@@ -28,8 +33,10 @@ async def crawl_and_save_namuwiki_text(team_key, url):
             await page.wait_for_selector('h2:has-text("개요")', state='attached', timeout=60000) 
 
             html_content = await page.content()
+            STATS.record('crawl.namu.fetch', time.perf_counter() - fetch_start)
             await browser.close() 
             
+            parse_start = time.perf_counter()
             soup = BeautifulSoup(html_content, 'html.parser')
             
             # 핵심 콘텐츠 영역 선택 
@@ -92,6 +99,9 @@ async def crawl_and_save_namuwiki_text(team_key, url):
                         extracted_text.append(paragraph_text)
 
 
+            STATS.record('crawl.namu.parse', time.perf_counter() - parse_start,
+                         nbytes=len(html_content.encode('utf-8')))
+
             # 결과를 TXT 파일로 저장
             full_path = os.path.join(output_dir, file_name)
 
@@ -102,6 +112,7 @@ async def crawl_and_save_namuwiki_text(team_key, url):
                 f.write('\n'.join(extracted_text))
             
             print(f"✅ [{team_key}] 데이터 크롤링 및 저장이 완료되었습니다: {full_path}")
+            STATS.count('crawl.namu.ok')
             return full_path
 
         except Exception as e:
@@ -110,6 +121,7 @@ async def crawl_and_save_namuwiki_text(team_key, url):
                 await browser.close() 
             except:
                 pass
+            STATS.count('crawl.namu.fail')
             print(f"❌ [{team_key}] 크롤링 중 예외 발생: {e}")
             return None
 
@@ -141,6 +153,7 @@ async def main_async():
     await asyncio.gather(*tasks) 
     
     print("\n모든 팀에 대한 크롤링 작업이 완료되었습니다.")
+    STATS.write_report('crawl_namu')
 
 if __name__ == "__main__":
     # asyncio.run()은 최상위 비동기 함수(main_async)만 실행한다.
@@ -3,6 +3,10 @@ from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 import os
 import re
+import time
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline_stats import STATS
 from urllib.parse import unquote
 
 # --- 설정 및 데이터 ---
@@ -51,9 +55,11 @@ async def crawl_namuwiki_content(url):
         page = await context.new_page()
         
         try:
+            fetch_start = time.perf_counter()
             response = await page.goto(url, timeout=60000)
             if response is None or response.status >= 400:
                 print(f"❌ HTTP 요청 실패: {response.status if response else 'N/A'} - {url}")
+                STATS.count('crawl.namu_season.fail')
                 await browser.close()
                 return None
             
@@ -64,8 +70,10 @@ async def crawl_namuwiki_content(url):
                 print(f"⚠️ H2 태그를 찾는데 시간이 오래 걸리거나 실패했습니다. 계속 진행합니다.")
 
             html_content = await page.content()
+            STATS.record('crawl.namu_season.fetch', time.perf_counter() - fetch_start)
             await browser.close() 
             
+            parse_start = time.perf_counter()
             soup = BeautifulSoup(html_content, 'html.parser')
             
             # 본문 컨테이너 찾기
@@ -135,8 +143,13 @@ async def crawl_namuwiki_content(url):
                 seen_texts.add(text)
                 extracted_data.append(text)
 
+            STATS.record('crawl.namu_season.parse', time.perf_counter() - parse_start,
+                         nbytes=len(html_content.encode('utf-8')))
+            STATS.count('crawl.namu_season.ok')
+
         except Exception as e:
             print(f"❌ 크롤링 중 예외 발생: {e} - {url}")
+            STATS.count('crawl.namu_season.fail')
             return None
 
     return extracted_data
@@ -245,9 +258,11 @@ async def main_async():
             
     print(f"\n총 {len(all_collected_text)}개의 텍스트 청크를 수집했습니다. 분류를 시작합니다...")
     
-    classify_and_save(all_collected_text)
+    with STATS.timer('crawl.namu_season.classify'):
+        classify_and_save(all_collected_text)
     
     print("\n모든 작업이 완료되었습니다.")
+    STATS.write_report('crawl_namu_season')
 
 if __name__ == "__main__":
     asyncio.run(main_async())
@@ -2,6 +2,9 @@ import requests
 from bs4 import BeautifulSoup
 import os
 import time
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pipeline_stats import STATS
 
 def crawl_and_save_wikipedia_text(team_name_en, url):
     headers = {
@@ -14,9 +17,11 @@ def crawl_and_save_wikipedia_text(team_name_en, url):
     os.makedirs(output_dir, exist_ok=True) # 폴더 없으면 생성
 
     try:
-        response = requests.get(url, headers=headers)
+        with STATS.timer('crawl.wiki.fetch'):
+            response = requests.get(url, headers=headers)
         response.raise_for_status() # HTTP 오류가 발생하면 예외 발생
 
+        parse_start = time.perf_counter()
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # 핵심 콘텐츠 영역만 선택 (위키피디아 기준)
@@ -58,6 +63,8 @@ def crawl_and_save_wikipedia_text(team_name_en, url):
                     extracted_text.append(text_content)
 
 
+        STATS.record('crawl.wiki.parse', time.perf_counter() - parse_start, nbytes=len(response.content))
+
         # 결과를 TXT 파일로 저장
         full_path = os.path.join(output_dir, file_name)
         with open(full_path, 'w', encoding='utf-8') as f:
@@ -66,9 +73,11 @@ def crawl_and_save_wikipedia_text(team_name_en, url):
             f.write('\n'.join(extracted_text))
             
         print(f"✅ [{team_name_en}] 데이터 크롤링 및 저장이 완료되었습니다: {full_path}")
+        STATS.count('crawl.wiki.ok')
         return full_path
 
     except requests.exceptions.RequestException as e:
+        STATS.count('crawl.wiki.fail')
         print(f"❌ [{team_name_en}] 크롤링 오류 발생: {e}")
         return None
 
@@ -92,4 +101,5 @@ for team_name, url in f1_teams.items():
     crawl_and_save_wikipedia_text(team_name, url)
     time.sleep(2)
     
-print("\n모든 팀에 대한 크롤링 작업이 완료되었습니다.")
\ No newline at end of file
+print("\n모든 팀에 대한 크롤링 작업이 완료되었습니다.")
+STATS.write_report('crawl_wiki')
\ No newline at end of file
@@ -0,0 +1,149 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import signal
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# ---------------------------------------------------------
+# 파이프라인 공용 계측 도구 (타이머 / 카운터 / 실행 리포트 / 프로파일링)
+# ---------------------------------------------------------
+# 크롤링 -> 전처리 -> LLM 추출 -> final_team_data JSON -> 라벨 생성 -> 학습
+# 각 단계 스크립트는 폴더가 달라서 아래처럼 저장소 루트를 경로에 추가한 뒤 import 한다.
+#   sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+#   from pipeline_stats import STATS
+#
+#   with STATS.timer('crawl.fetch'):           # 구간 시간
+#       ...
+#   with STATS.timer('preprocess', nbytes=n):  # 처리량(MB/s)까지 기록
+#       ...
+#   STATS.count('llm.cache_hit')               # 카운터
+#   STATS.write_report('label_generation')     # pipeline_reports/*.json 저장
+REPORT_DIR = os.getenv('PIPELINE_REPORT_DIR', 'pipeline_reports')
+PROFILE_DIR = os.getenv('PIPELINE_PROFILE_DIR', 'pipeline_profiles')
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+class Stats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.timers = {}    # name -> [초, ...]
+        self.bytes = {}     # name -> 누적 바이트
+        self.counters = {}  # name -> 누적 값
+
+    @contextmanager
+    def timer(self, name, nbytes=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, nbytes)
+
+    def record(self, name, seconds, nbytes=None):
+        self.timers.setdefault(name, []).append(seconds)
+        if nbytes is not None:
+            self.bytes[name] = self.bytes.get(name, 0) + nbytes
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        timers = {}
+        for name, values in self.timers.items():
+            ordered = sorted(values)
+            total = sum(ordered)
+            row = {
+                "count": len(ordered),
+                "total_s": round(total, 6),
+                "mean_ms": round(total / len(ordered) * 1000, 4),
+                "p50_ms": round(_percentile(ordered, 0.50) * 1000, 4),
+                "p95_ms": round(_percentile(ordered, 0.95) * 1000, 4),
+                "max_ms": round(ordered[-1] * 1000, 4),
+            }
+            if name in self.bytes:
+                row["mb"] = round(self.bytes[name] / 1e6, 4)
+                row["mb_per_s"] = round(self.bytes[name] / 1e6 / total, 4) if total > 0 else None
+            timers[name] = row
+        return {
+            "started_at": self.started_at.isoformat(timespec='seconds'),
+            "wall_s": round(time.perf_counter() - self._start, 6),
+            "timers": timers,
+            "counters": dict(self.counters),
+        }
+
+    def write_report(self, run_name, out_dir=None):
+        """실행 리포트를 JSON으로 저장하고 단계별 소요 시간을 출력한다."""
+        out_dir = out_dir or REPORT_DIR
+        os.makedirs(out_dir, exist_ok=True)
+        report = {"run": run_name, **self.summary()}
+        path = os.path.join(out_dir, f"{run_name}_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(f"\n📈 [{run_name}] 단계별 소요 시간 (전체 {report['wall_s']:.2f}초)")
+        for name, row in sorted(report['timers'].items(), key=lambda kv: -kv[1]['total_s']):
+            extra = f", {row['mb_per_s']} MB/s" if row.get('mb_per_s') else ""
+            print(f"   - {name}: {row['total_s']:.3f}초 / {row['count']}회 (평균 {row['mean_ms']:.2f} ms{extra})")
+        for name, value in report['counters'].items():
+            print(f"   - {name}: {value}")
+        print(f"📝 리포트 저장: {path}")
+        return path
+
+
+STATS = Stats()
+
+
+# ---------------------------------------------------------
+# 선택한 단계만 프로파일링
+# ---------------------------------------------------------
+# 환경 변수로 켠다. 코드 수정 없이 원하는 단계만 잡을 수 있다.
+#   PIPELINE_PROFILE=label_generation          -> cProfile (.prof + 상위 30개 함수 txt)
+#   PIPELINE_PROFILE=label_generation:pyspy    -> py-spy record (flamegraph .svg, py-spy 설치 필요)
+@contextmanager
+def profile_stage(stage):
+    target, _, mode = os.getenv('PIPELINE_PROFILE', '').partition(':')
+    if target != stage:
+        yield
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    base = os.path.join(PROFILE_DIR, f"{stage}_{stamp}")
+
+    if mode == 'pyspy':
+        proc = subprocess.Popen(['py-spy', 'record', '-o', base + '.svg', '--pid', str(os.getpid())])
+        try:
+            yield
+        finally:
+            # SIGINT 를 받아야 py-spy 가 결과 파일을 쓰고 종료한다
+            proc.send_signal(signal.SIGINT)
+            proc.wait()
+            print(f"🔥 py-spy 결과 저장: {base}.svg")
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(base + '.prof')
+        buf = io.StringIO()
+        pstats.Stats(profiler, stream=buf).sort_stats('cumulative').print_stats(30)
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(buf.getvalue())
+        print(f"🔍 cProfile 결과 저장: {base}.prof / {base}.txt")